@@ -0,0 +1,30 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Scale ml-100k up by tiling: copy c shifts every userId and movieId by c * offset,
+# so users, items and ratings all grow by `factor` while per-user behaviour is unchanged
+def tileDataset(ratingsDF: pd.DataFrame, metadataDF: pd.DataFrame, factor: int):
+    if factor == 1:
+        return ratingsDF.copy(), metadataDF.copy()
+
+    userOffset = int(ratingsDF["userId"].max())
+    movieOffset = int(max(ratingsDF["movieId"].max(), metadataDF["movieId"].max()))
+    copies = np.arange(factor)
+
+    ratings = pd.DataFrame({
+        column: np.tile(ratingsDF[column].to_numpy(), factor) for column in ratingsDF.columns
+    })
+    ratings["userId"] += np.repeat(copies * userOffset, len(ratingsDF))
+    ratings["movieId"] += np.repeat(copies * movieOffset, len(ratingsDF))
+
+    metadata = pd.concat([metadataDF] * factor, ignore_index=True)
+    metadata["movieId"] += np.repeat(copies * movieOffset, len(metadataDF))
+    return ratings, metadata
+
+# Write a tiled dataset in the ml-100k file layout and return the folder
+def writeDataset(ratingsDF: pd.DataFrame, metadataDF: pd.DataFrame, folder: str) -> str:
+    os.makedirs(folder, exist_ok=True)
+    ratingsDF.to_csv(os.path.join(folder, "ratings.csv"), index=False)
+    metadataDF.to_csv(os.path.join(folder, "omdb_metadata.csv"), index=False)
+    return folder
@@ -0,0 +1,70 @@
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+from utils.dataLoader import MetadataPreprocessor
+from utils.syntheticData import SyntheticDatasetGenerator
+
+# Feature build time of the serial sklearn path vs the process-pool path at several worker
+# counts, on a synthetic catalogue whose plots borrow ml-100k overviews for a real vocabulary.
+# Speedup is bounded by the cores actually available (reported as "cpus").
+# Run from movie-recommender/: python -m benchmarks.featureScaling --movies 200000 --workers 2,4,8
+class FeatureScalingBenchmark:
+    def __init__(self, numMovies: int = 200000, workerCounts=(2, 4, 8), maxFeatures: int = 1000,
+                 repeats: int = 1, seed: int = 42):
+        self.numMovies = numMovies
+        self.workerCounts = workerCounts
+        self.maxFeatures = maxFeatures
+        self.repeats = repeats
+        self.seed = seed
+
+    def run(self) -> dict:
+        print(f"\n Running Feature Scaling Benchmark ({self.numMovies:,} movies, {os.cpu_count()} cpus): \n")
+        metadata = self._catalogue()
+
+        serial = MetadataPreprocessor(metadata)
+        reference = self._build(serial)
+        results = {"cpus": os.cpu_count(), "movies": len(metadata), "serialS": self._time(lambda: self._build(serial))}
+        print(f"  - {'serial':<10} {results['serialS']:8.2f} s")
+
+        for workers in self.workerCounts:
+            parallel = MetadataPreprocessor(metadata, numWorkers=workers, parallelMinRows=0)
+            features = self._build(parallel)
+            same = all(a.columns.equals(b.columns) and np.array_equal(a.to_numpy(), b.to_numpy())
+                       for a, b in zip(reference, features))
+            seconds = self._time(lambda: self._build(parallel))
+            results[f"workers{workers}"] = {"seconds": seconds, "speedup": results["serialS"] / seconds, "identical": same}
+            print(f"  - {f'{workers} workers':<10} {seconds:8.2f} s  {results['serialS'] / seconds:5.2f}x  "
+                  f"identical: {same}")
+        return results
+
+    def _build(self, processor: MetadataPreprocessor) -> tuple:
+        return processor.encodeCategoricalFeatures(), processor.applyTfidfToPlots(self.maxFeatures)
+
+    def _catalogue(self) -> pd.DataFrame:
+        generator = SyntheticDatasetGenerator(numUsers=1, numMovies=self.numMovies, numRatings=1, seed=self.seed)
+        metadata = pd.concat([chunk[2] for chunk in generator.iterMovieChunks()], ignore_index=True)
+        overviews = pd.read_csv("ml-100k/omdb_metadata.csv")["overview"].dropna().to_numpy()
+        picks = np.random.default_rng(self.seed).integers(0, len(overviews), len(metadata))
+        metadata["overview"] = metadata["overview"] + " " + overviews[picks]
+        return metadata
+
+    def _time(self, fn) -> float:
+        timings = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel feature build scaling benchmark")
+    parser.add_argument("--movies", type=int, default=200000)
+    parser.add_argument("--workers", default="2,4,8", help="comma-separated worker counts")
+    parser.add_argument("--max-features", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=1)
+    args = parser.parse_args()
+    FeatureScalingBenchmark(numMovies=args.movies, workerCounts=[int(w) for w in args.workers.split(",")],
+                            maxFeatures=args.max_features, repeats=args.repeats).run()
@@ -0,0 +1,160 @@
+import argparse
+import statistics
+import time
+import numpy as np
+import pandas as pd
+from main import load_metadata, load_ratings, binarize_ratings
+from utils.dataLoader import MetadataPreprocessor
+from models.contentFilter import ContentBasedFilter
+from models.collabFilter import CollaborativeFilter
+from models.hybrid import HybridRecommender
+from utils.helpers import minMaxScale, topKIndices
+
+# Storage precision of the scoring path: float64 factors and features (the old layout) vs
+# float32 everywhere.
+# Accuracy drift is measured against a pure float64 blend; memory counts every array the
+# models keep for scoring. Larger catalogues are made by tiling the ml-100k arrays with noise.
+# Run from movie-recommender/: python -m benchmarks.precisionBench --scales 1,100
+class PrecisionBenchmark:
+    def __init__(self, scales=(1, 100), numUsers: int = 200, topN: int = 10, repeats: int = 50,
+                 numFactors: int = 100, seed: int = 42):
+        self.scales = scales
+        self.numUsers = numUsers
+        self.topN = topN
+        self.repeats = repeats
+        self.numFactors = numFactors
+        self.seed = seed
+
+    def run(self) -> dict:
+        print("\n Running Precision Benchmark: \n")
+        metadata = load_metadata()
+        ratings, _ = load_ratings()
+        binRatings = binarize_ratings(ratings)
+
+        processor = MetadataPreprocessor(metadata)
+        features = pd.concat([
+            processor.encodeCategoricalFeatures(),
+            processor.applyTfidfToPlots(),
+            processor.normalizeVoteAverage(),
+        ], axis=1).astype(np.float64)
+        features.index = metadata["movieId"].values
+        collab = CollaborativeFilter(numFactors=self.numFactors, dtype=np.float64)
+        collab.trainModel(binRatings)
+        userIds = collab.userIndex.ids
+
+        results = {}
+        for factor in self.scales:
+            print(f" Scale x{factor}")
+            tiledFeatures, movieIds, movieFactors = self._tile(features, collab.movieIndex.ids, collab.movieFactors, factor)
+            results[f"x{factor}"] = self._runScale(tiledFeatures, userIds, collab.userFactors, movieIds,
+                                                   movieFactors, binRatings)
+        return results
+
+    def _runScale(self, features, userIds, userFactors, movieIds, movieFactors, binRatings) -> dict:
+        rng = np.random.default_rng(self.seed)
+        configs = {}
+        for name, dtype in (("float64", np.float64), ("float32", np.float32)):
+            content = ContentBasedFilter(metadataDF=None)
+            content.featureMatrix = features.astype(dtype)
+            collab = CollaborativeFilter(numFactors=self.numFactors, dtype=dtype)
+            collab.setFactors(userIds, movieIds, userFactors, movieFactors)
+            configs[name] = HybridRecommender(content, collab, alpha=0.5)
+
+        # Users with at least topN liked movies in the content catalogue; five likes act as favorites
+        contentIds = features.index.to_numpy()
+        liked = binRatings[(binRatings["binaryRating"] == 1) & binRatings["movieId"].isin(contentIds)]
+        counts = liked["userId"].value_counts()
+        candidates = counts[counts >= self.topN].index.to_numpy()
+        users = rng.choice(candidates, size=min(self.numUsers, len(candidates)), replace=False)
+        requests = [(int(u), rng.choice(liked.loc[liked["userId"] == u, "movieId"].to_numpy(), 5, replace=False).tolist())
+                    for u in users]
+
+        reference = self._referenceScorer(features, userIds, userFactors, movieIds, movieFactors)
+        rows = {}
+        for name, hybrid in configs.items():
+            overlap, exact, drift = [], 0, 0.0
+            for userId, favorites in requests:
+                profile = hybrid.contentModel.buildUserProfileArray(favorites)
+                refScores, refTop = reference(userId, favorites)
+                top = hybrid.recommendMovies(userId, profile, self.topN, exclude=favorites)
+                overlap.append(len(set(top) & set(refTop)) / self.topN)
+                exact += top == refTop
+                drift = max(drift, float(np.abs(hybrid.blendArray(userId, profile) - refScores).max()))
+
+            userId, favorites = requests[0]
+            profile = hybrid.contentModel.buildUserProfileArray(favorites)
+            timing = self._time(lambda: hybrid.recommendMovies(userId, profile, self.topN, exclude=favorites))
+            rows[name] = {"overlapAtN": float(np.mean(overlap)), "exactMatch": exact / len(requests),
+                          "maxScoreDrift": drift, "medianMs": timing, "scoringMB": self._scoringBytes(hybrid) / 1e6}
+
+        print(f"  {'Storage':<9} {'Overlap@' + str(self.topN):>10} {'Exact':>7} {'Max drift':>10} {'ms/req':>8} {'MB':>9}")
+        for name, row in rows.items():
+            print(f"  {name:<9} {row['overlapAtN']:>10.3f} {row['exactMatch']:>7.2f} {row['maxScoreDrift']:>10.2e} "
+                  f"{row['medianMs']:>8.3f} {row['scoringMB']:>9.2f}")
+        return rows
+
+    # Top-N and blended scores computed entirely in float64, as the drift reference
+    def _referenceScorer(self, features, userIds, userFactors, movieIds, movieFactors):
+        featureArray = features.to_numpy(dtype=np.float64)
+        contentIds = features.index.to_numpy()
+        userRows = {int(u): i for i, u in enumerate(userIds)}
+        movieRows = pd.Series(np.arange(len(movieIds)), index=movieIds)
+        collabRows = movieRows.reindex(contentIds).to_numpy()
+        aligned = np.zeros((len(contentIds), movieFactors.shape[1]))
+        known = ~np.isnan(collabRows)
+        aligned[known] = np.asarray(movieFactors, dtype=np.float64)[collabRows[known].astype(np.int64)]
+        rowOf = pd.Series(np.arange(len(contentIds)), index=contentIds)
+
+        def score(userId, favorites):
+            favRows = rowOf.reindex(favorites).dropna().to_numpy(dtype=np.int64)
+            profile = featureArray[favRows].mean(axis=0)
+            userVector = np.asarray(userFactors[userRows[userId]], dtype=np.float64)
+            blended = 0.5 * minMaxScale(featureArray @ profile) + 0.5 * minMaxScale(aligned @ userVector)
+            return blended, contentIds[topKIndices(blended, self.topN, favRows)].tolist()
+        return score
+
+    # Bytes of every distinct array the models hold for scoring
+    def _scoringBytes(self, hybrid) -> int:
+        content, collab = hybrid.contentModel, hybrid.collabModel
+        arrays = [content.featureMatrix.to_numpy(copy=False), content.featureArray, collab.userFactors,
+                  collab.movieFactors, collab.movieFactorArray, hybrid._alignedFactors]
+        seen, total = set(), 0
+        for array in arrays:
+            if array is not None and id(array) not in seen:
+                seen.add(id(array))
+                total += array.nbytes
+        return total
+
+    # Copy c of the catalogue gets ids shifted by c * offset and 1% noise so copies do not tie
+    def _tile(self, features, movieIds, movieFactors, factor: int):
+        if factor == 1:
+            return features, movieIds, movieFactors
+        rng = np.random.default_rng(self.seed)
+        offset = int(max(features.index.max(), movieIds.max()))
+        shifts = np.repeat(np.arange(factor) * offset, len(features))
+        featureArray = np.tile(features.to_numpy(), (factor, 1))
+        featureArray[len(features):] *= 1 + 0.01 * rng.standard_normal((len(featureArray) - len(features), 1))
+        tiledFeatures = pd.DataFrame(featureArray, index=np.tile(features.index.to_numpy(), factor) + shifts,
+                                     columns=features.columns)
+        tiledIds = np.tile(movieIds, factor) + np.repeat(np.arange(factor) * offset, len(movieIds))
+        tiledFactors = np.tile(movieFactors, (factor, 1))
+        tiledFactors[len(movieIds):] += 0.01 * rng.standard_normal((len(tiledFactors) - len(movieIds), movieFactors.shape[1]))
+        return tiledFeatures, tiledIds, tiledFactors
+
+    def _time(self, fn) -> float:
+        for _ in range(3):
+            fn()
+        timings = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Storage precision benchmark")
+    parser.add_argument("--scales", default="1,100", help="comma-separated catalogue scale factors")
+    parser.add_argument("--users", type=int, default=200)
+    args = parser.parse_args()
+    PrecisionBenchmark(scales=[int(s) for s in args.scales.split(",")], numUsers=args.users).run()
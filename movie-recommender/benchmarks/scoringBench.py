@@ -0,0 +1,73 @@
+import time
+import numpy as np
+import pandas as pd
+from main import load_data, preprocess, train_models
+
+# Per-request latency of the pandas scoring path vs the NumPy core
+# Run from movie-recommender/: python -m benchmarks.scoringBench
+class ScoringBenchmark:
+    def __init__(self, repeats: int = 200, topN: int = 10):
+        self.repeats = repeats
+        self.topN = topN
+        self._legacyMappings = None
+
+    def run(self):
+        print("\n Running Scoring Benchmark: \n")
+        metadata, ratings, movies = load_data()
+        features, binRatings = preprocess(metadata, ratings)
+        content, collab, hybrid = train_models(metadata, binRatings, features, movies)
+        favorites = metadata["movieId"].head(5).tolist()
+        userId = int(binRatings["userId"].iloc[0])
+
+        legacyIds = self._legacyRequest(content, collab, hybrid, userId, favorites)
+        coreIds = self._coreRequest(content, hybrid, userId, favorites)
+        print(f" Same top-{self.topN}: {legacyIds == coreIds}")
+
+        legacyMs = self._time(lambda: self._legacyRequest(content, collab, hybrid, userId, favorites))
+        coreMs = self._time(lambda: self._coreRequest(content, hybrid, userId, favorites))
+        print(f" pandas path: {legacyMs:.3f} ms/request")
+        print(f" NumPy core:  {coreMs:.3f} ms/request")
+        print(f" Speedup:     {legacyMs / coreMs:.1f}x")
+        return {"legacyMs": legacyMs, "coreMs": coreMs}
+
+    # Profile -> blend -> top-N exactly as main.run_recommendation used to do it, including the
+    # per-movie dict lookups of the old userIdMapping / movieIdMapping
+    def _legacyRequest(self, content, collab, hybrid, userId, favorites):
+        if self._legacyMappings is None:
+            self._legacyMappings = ({int(uid): idx for idx, uid in enumerate(collab.userIndex.ids)},
+                                    {int(mid): idx for idx, mid in enumerate(collab.movieIndex.ids)})
+        userIdMapping, movieIdMapping = self._legacyMappings
+
+        featureMatrix = content.featureMatrix
+        validIds = [mid for mid in favorites if mid in featureMatrix.index]
+        profile = featureMatrix.loc[validIds].mean()
+
+        contentScores = pd.Series(featureMatrix @ profile, index=featureMatrix.index)
+        collabScores = {}
+        for movieId in featureMatrix.index:
+            if movieId in movieIdMapping:
+                collabScores[movieId] = np.dot(collab.userFactors[userIdMapping[userId]], collab.movieFactors[movieIdMapping[movieId]])
+            else:
+                collabScores[movieId] = 0.0
+        collabScores = pd.Series(collabScores)
+
+        contentScores = (contentScores - contentScores.min()) / (contentScores.max() - contentScores.min() + 1e-8)
+        collabScores = (collabScores - collabScores.min()) / (collabScores.max() - collabScores.min() + 1e-8)
+        blended = hybrid.alpha * contentScores + (1 - hybrid.alpha) * collabScores
+        return blended.drop(index=favorites, errors="ignore").sort_values(ascending=False).head(self.topN).index.tolist()
+
+    def _coreRequest(self, content, hybrid, userId, favorites):
+        profile = content.buildUserProfileArray(favorites)
+        return hybrid.recommendMovies(userId, profile, self.topN, exclude=favorites)
+
+    def _time(self, fn) -> float:
+        for _ in range(5):
+            fn()
+        start = time.perf_counter()
+        for _ in range(self.repeats):
+            fn()
+        return (time.perf_counter() - start) / self.repeats * 1000
+
+
+if __name__ == "__main__":
+    ScoringBenchmark().run()
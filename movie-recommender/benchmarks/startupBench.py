@@ -0,0 +1,46 @@
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# What main.py used to import at module load, before training-only imports became lazy
+EAGER_IMPORTS = ("import pandas, requests, sklearn.decomposition, sklearn.preprocessing, "
+                 "sklearn.feature_extraction.text, sklearn.metrics.pairwise")
+
+# Wall-clock startup of fresh interpreters: eager imports vs lazy main vs serving from a saved model
+# Run from movie-recommender/: python -m benchmarks.startupBench
+class StartupBenchmark:
+    def __init__(self, repeats: int = 5):
+        self.repeats = repeats
+
+    def run(self):
+        print("\n Running Startup Benchmark: \n")
+        with tempfile.TemporaryDirectory() as artifactDir:
+            self._time([sys.executable, "main.py", "--save-model", artifactDir], repeats=1)
+
+            results = {
+                "eagerImports": self._time([sys.executable, "-c", EAGER_IMPORTS]),
+                "importMain": self._time([sys.executable, "-c", "import main"]),
+                "serveFromModel": self._time([sys.executable, "main.py", "--from-model", artifactDir]),
+                "trainAndServe": self._time([sys.executable, "main.py", "--force"], repeats=1),
+            }
+
+        for name, seconds in results.items():
+            print(f"  - {name:<15} {seconds:.3f} s")
+        print(f"\n Serve-from-model startup is {results['serveFromModel'] / results['eagerImports']:.0%} "
+              f"of the old import cost alone")
+        return results
+
+    # Median wall time of running cmd in a fresh interpreter
+    def _time(self, cmd, repeats: int = None) -> float:
+        timings = []
+        for _ in range(repeats or self.repeats):
+            start = time.perf_counter()
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    StartupBenchmark().run()
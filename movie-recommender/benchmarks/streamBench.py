@@ -0,0 +1,69 @@
+import os
+import tempfile
+import threading
+import time
+from main import load_data, preprocess, train_models
+from utils.streamIngest import FileTailSource, QueueSource, StreamIngestor
+
+# Replay the most recent ml-100k ratings as a live stream, through the queue stand-in and
+# through a tailed append-only file, and report ingest throughput and update latency.
+# Run from movie-recommender/: python -m benchmarks.streamBench
+class StreamBenchmark:
+    def __init__(self, numEvents: int = 5000, rate: float = 2000.0, batchSize: int = 256, maxDelay: float = 0.05):
+        self.numEvents = numEvents
+        self.rate = rate                # events per second written by the producer
+        self.batchSize = batchSize
+        self.maxDelay = maxDelay
+
+    def run(self) -> dict:
+        print("\n Running Stream Benchmark: \n")
+        metadata, ratings, movies = load_data()
+        events = ratings.sort_values("timestamp").tail(self.numEvents)[["userId", "movieId", "rating"]]
+        events = list(events.itertuples(index=False, name=None))
+
+        results = {}
+        for name in ("queue", "file"):
+            features, binRatings = preprocess(metadata, ratings)
+            _, _, hybrid = train_models(metadata, binRatings, features, movies)   # fresh models per run
+            results[name] = self._replay(name, hybrid, events)
+
+        print(f"\n {'Source':<7} {'Events':>7} {'Ev/s':>8} {'Apply ev/s':>11} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8} {'Batch ms':>9}")
+        for name, m in results.items():
+            print(f" {name:<7} {m['events']:>7} {m['eventsPerSec']:>8.0f} {m['applyEventsPerSec']:>11.0f} "
+                  f"{m['latencyP50Ms']:>8.2f} {m['latencyP95Ms']:>8.2f} {m['latencyP99Ms']:>8.2f} {m['meanBatchMs']:>9.2f}")
+        return results
+
+    def _replay(self, name: str, hybrid, events: list) -> dict:
+        with tempfile.TemporaryDirectory() as workDir:
+            if name == "queue":
+                source = QueueSource()
+                write = lambda chunk: [source.put(*event) for event in chunk]
+            else:
+                path = os.path.join(workDir, "stream.csv")
+                open(path, "w").close()
+                source = FileTailSource(path)
+                def write(chunk):
+                    with open(path, "a") as f:
+                        f.write("".join(f"{u},{m},{r}\n" for u, m, r in chunk))
+
+            ingestor = StreamIngestor(hybrid, source, batchSize=self.batchSize, maxDelay=self.maxDelay)
+            producer = threading.Thread(target=self._produce, args=(events, write), daemon=True)
+            producer.start()
+            metrics = ingestor.run(maxEvents=len(events), idleTimeout=2.0)
+            producer.join()
+        return metrics
+
+    # Write events in 10 ms chunks at the target rate
+    def _produce(self, events: list, write) -> None:
+        perChunk = max(1, int(self.rate * 0.01))
+        start = time.perf_counter()
+        for i in range(0, len(events), perChunk):
+            delay = start + i / self.rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            write(events[i:i + perChunk])
+
+
+if __name__ == "__main__":
+    StreamBenchmark().run()
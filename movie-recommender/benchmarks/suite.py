@@ -0,0 +1,220 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from utils.dataLoader import IMDbLoader, MovieLensLoader, MetadataPreprocessor, RatingsPreprocessor
+from models.contentFilter import ContentBasedFilter
+from models.collabFilter import CollaborativeFilter
+from models.hybrid import HybridRecommender
+from utils.omdbFetcher import OmdbFetcher
+from utils.titleResolver import TitleResolver
+from benchmarks.datasets import tileDataset, writeDataset
+
+# Reproducible benchmarks for loading, training, feature building and scoring on ml-100k
+# and tiled 10x / 100x copies of it, with JSON output and a baseline comparison.
+# Run from movie-recommender/:
+#   python -m benchmarks.suite --save-baseline          (record benchmarks/baseline.json)
+#   python -m benchmarks.suite --fail-on-regression     (compare the current tree against it)
+
+DEFAULT_OUT = "benchmarks/results.json"
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+# Time fn after `warmup` untimed calls; returns summary statistics in milliseconds
+def timeCase(fn, warmup: int, repeats: int) -> dict:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "medianMs": statistics.median(timings),
+        "meanMs": statistics.mean(timings),
+        "minMs": min(timings),
+        "stdevMs": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "repeats": repeats,
+    }
+
+class BenchmarkSuite:
+    def __init__(self, scales=(1, 10, 100), warmup: int = 1, repeats: int = 5, batchSize: int = 64,
+                 numFactors: int = 30, maxDenseGB: float = 1.0, seed: int = 42):
+        self.scales = scales
+        self.warmup = warmup
+        self.repeats = repeats
+        self.batchSize = batchSize
+        self.numFactors = numFactors
+        self.maxDenseGB = maxDenseGB
+        self.seed = seed
+
+    def run(self) -> dict:
+        ratingsDF = MovieLensLoader("ml-100k/ratings.csv").loadRatings()
+        metadataDF = pd.read_csv("ml-100k/omdb_metadata.csv")
+
+        results = {"meta": self._meta(), "scales": {}}
+        with tempfile.TemporaryDirectory() as workDir:
+            for factor in self.scales:
+                print(f"\n Scale x{factor}")
+                ratings, metadata = tileDataset(ratingsDF, metadataDF, factor)
+                folder = writeDataset(ratings, metadata, os.path.join(workDir, f"x{factor}"))
+                results["scales"][f"x{factor}"] = self._runScale(folder)
+                del ratings, metadata
+        return results
+
+    def _runScale(self, folder: str) -> dict:
+        rng = np.random.default_rng(self.seed)
+        ratingsPath = os.path.join(folder, "ratings.csv")
+        cachePath = os.path.join(folder, "omdb_metadata.csv")
+        cases = {}
+
+        cases["ratingsLoad"] = self._case("ratingsLoad", lambda: MovieLensLoader(ratingsPath).loadRatings())
+        ratings = RatingsPreprocessor(MovieLensLoader(ratingsPath).loadRatings()).binarizeRatings()
+
+        imdb = IMDbLoader(linksPath=None, apiKey="", cachePath=cachePath)
+        imdb.loadMetadata()
+        metadata = imdb.preprocessMetadata()
+        processor = MetadataPreprocessor(metadata)
+        cases["featureBuild"] = self._case("featureBuild", lambda: pd.concat([
+            processor.encodeCategoricalFeatures(),
+            processor.applyTfidfToPlots(),
+            processor.normalizeVoteAverage(),
+        ], axis=1))
+
+        # pivot_table densifies users x movies; past the memory budget use random factors instead
+        userIds = np.unique(ratings["userId"].to_numpy())
+        movieIds = np.unique(ratings["movieId"].to_numpy())
+        denseGB = len(userIds) * len(movieIds) * 8 / 1e9
+        collab = CollaborativeFilter(numFactors=self.numFactors)
+        if denseGB <= self.maxDenseGB:
+            cases["trainModel"] = self._case("trainModel", lambda: collab.trainModel(ratings))
+            collab.trainModel(ratings)
+        else:
+            print(f"  - {'trainModel':<15} skipped (dense interaction matrix needs {denseGB:.1f} GB)")
+            cases["trainModel"] = {"skipped": f"dense interaction matrix needs {denseGB:.1f} GB"}
+            collab.setFactors(userIds, movieIds,
+                              rng.standard_normal((len(userIds), self.numFactors)),
+                              rng.standard_normal((len(movieIds), self.numFactors)))
+
+        features = pd.concat([
+            processor.encodeCategoricalFeatures(),
+            processor.applyTfidfToPlots(),
+            processor.normalizeVoteAverage(),
+        ], axis=1)
+        features.index = metadata["movieId"].values
+        content = ContentBasedFilter(metadata)
+        content.featureMatrix = features
+        hybrid = HybridRecommender(content, collab, alpha=0.5)
+
+        contentIds = metadata["movieId"].to_numpy()
+        userId = int(userIds[0])
+        favorites = rng.choice(contentIds, size=5, replace=False).tolist()
+        profile = content.buildUserProfileArray(favorites)
+        batchUsers = rng.choice(userIds, size=min(self.batchSize, len(userIds)), replace=False).tolist()
+        batchProfiles = np.stack([
+            content.buildUserProfileArray(rng.choice(contentIds, size=5, replace=False)) for _ in batchUsers
+        ])
+
+        cases["blendSingle"] = self._case("blendSingle", lambda: hybrid.blendArray(userId, profile))
+        cases["blendBatch"] = self._case("blendBatch", lambda: hybrid.blendBatch(batchUsers, batchProfiles))
+        cases["topN"] = self._case("topN", lambda: hybrid.recommendMovies(userId, profile, 10, exclude=favorites))
+        cases["topNDiverse"] = self._case("topNDiverse", lambda: hybrid.recommendMovies(
+            userId, profile, 10, exclude=favorites, diversity=0.3))
+
+        # Title lookup as main.py and demo.py do it; the one-off dict build is not timed
+        resolver = TitleResolver(OmdbFetcher(apiKey="", cachePath=cachePath))
+        lookupIds = rng.choice(contentIds, size=10, replace=False).tolist()
+        resolver.resolve(lookupIds, prefetch=False)
+        cases["metadataLookup"] = self._case("metadataLookup", lambda: resolver.resolve(lookupIds, prefetch=False))
+
+        cases["shape"] = {"ratings": len(ratings), "users": len(userIds), "movies": len(movieIds),
+                          "contentMovies": len(contentIds), "features": features.shape[1]}
+        return cases
+
+    def _case(self, name: str, fn) -> dict:
+        result = timeCase(fn, self.warmup, self.repeats)
+        print(f"  - {name:<15} {result['medianMs']:10.3f} ms (median of {self.repeats})")
+        return result
+
+    def _meta(self) -> dict:
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "warmup": self.warmup,
+            "repeats": self.repeats,
+            "seed": self.seed,
+        }
+
+# Compare medians case by case; ratio > 1 + tolerance is a regression, < 1 - tolerance an improvement
+def compareResults(current: dict, baseline: dict, tolerance: float = 0.15) -> list:
+    rows = []
+    for scale, cases in current["scales"].items():
+        baseCases = baseline.get("scales", {}).get(scale, {})
+        for name, result in cases.items():
+            base = baseCases.get(name, {})
+            if "medianMs" not in result or "medianMs" not in base:
+                continue
+            ratio = result["medianMs"] / base["medianMs"] if base["medianMs"] else float("inf")
+            status = "regression" if ratio > 1 + tolerance else "improved" if ratio < 1 - tolerance else "ok"
+            rows.append({"scale": scale, "case": name, "baselineMs": base["medianMs"],
+                         "currentMs": result["medianMs"], "ratio": ratio, "status": status})
+    return rows
+
+def printComparison(rows: list) -> None:
+    print(f"\n{'Scale':<6} {'Case':<15} {'Baseline ms':>12} {'Current ms':>12} {'Ratio':>7}  Status")
+    print("-" * 68)
+    for row in rows:
+        print(f"{row['scale']:<6} {row['case']:<15} {row['baselineMs']:>12.3f} {row['currentMs']:>12.3f} "
+              f"{row['ratio']:>7.2f}  {row['status']}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Recommender benchmark suite")
+    parser.add_argument("--scales", default="1,10,100", help="comma-separated dataset scale factors")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-dense-gb", type=float, default=1.0, help="skip trainModel above this dense matrix size")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="where to write this run's JSON results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="also store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="relative slowdown tolerated before flagging")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on any regression")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    suite = BenchmarkSuite(scales=[int(s) for s in args.scales.split(",")], warmup=args.warmup,
+                           repeats=args.repeats, maxDenseGB=args.max_dense_gb)
+    results = suite.run()
+
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n Results written to {args.out}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f" Baseline stored at {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f" No baseline at {args.baseline}; run with --save-baseline first.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows = compareResults(results, baseline, args.tolerance)
+    printComparison(rows)
+    regressions = [row for row in rows if row["status"] == "regression"]
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
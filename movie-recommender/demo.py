@@ -4,8 +4,9 @@ from utils.dataLoader import IMDbLoader, MovieLensLoader, MetadataPreprocessor,
 from models.contentFilter import ContentBasedFilter
 from models.collabFilter import CollaborativeFilter
 from models.hybrid import HybridRecommender
-from utils.userProfile import UserProfile
+from utils.profileStore import ProfileStore
 from utils.omdbFetcher import OmdbFetcher
+from utils.titleResolver import TitleResolver
 from utils.helpers import precisionAtK, recallAtK
 
 def load_and_train():
@@ -22,13 +23,13 @@ def load_and_train():
         metadataProcessor.applyTfidfToPlots(),
         metadataProcessor.normalizeVoteAverage()
     ], axis=1)
+    contentFeatures.index = metadataDF["movieId"].values
 
     ratingsProcessor = RatingsPreprocessor(ratingsDF)
     binaryRatings = ratingsProcessor.binarizeRatings()
 
     contentModel = ContentBasedFilter(metadataDF)
     contentModel.featureMatrix = contentFeatures
-    contentModel.movieIdToIndex = {mid: idx for idx, mid in enumerate(metadataDF["movieId"])}
 
     collabModel = CollaborativeFilter(numFactors=30)
     collabModel.trainModel(binaryRatings)
@@ -42,13 +43,17 @@ def run_demo():
     print("\n🎥 Welcome to the Movie Recommender Demo!")
 
     metadataDF, contentModel, collabModel, hybridModel, fetcher, ratingsDF = load_and_train()
-    user = UserProfile(userId=999)
+    resolver = TitleResolver(fetcher)
+    store = ProfileStore("ml-100k/profiles.db")
+    user = store.get(999)
     user_feedback_df = pd.DataFrame({
         "userId": pd.Series(dtype="int"),
         "movieId": pd.Series(dtype="int"),
         "rating": pd.Series(dtype="float")
     })
-    all_liked_ids = set()
+    all_liked_ids = set(user.favorites)
+    if all_liked_ids:
+        print("\n👋 Welcome back! Saved favorites: " + " | ".join(resolver.resolve(sorted(all_liked_ids)).values()))
 
     while True:
         print("\n🍿 Enter some movies you like (by name, partial names allowed). Type 'done' to exit.")
@@ -77,27 +82,25 @@ def run_demo():
             continue
 
         user.addFavorites(matched_ids)
+        store.put(user)
+        store.flush()   # write now: put() only queues, and the session can end on Ctrl-C or an error
         all_liked_ids.update(matched_ids)
         print("\n❤️ Your Favorites:")
-        print(" | ".join([fetcher.getMovieTitle(mid) for mid in sorted(all_liked_ids)]))
+        print(" | ".join(resolver.resolve(sorted(all_liked_ids)).values()))
 
         while True:
-            userProfile = contentModel.buildUserProfile(user.favorites)
-            blendedScores = hybridModel.blendScores(user.userId, userProfile)
-            filteredScores = blendedScores.drop(index=user.favorites, errors='ignore')
-            topMovieIds = filteredScores.sort_values(ascending=False).head(10).index.tolist()
+            userProfile = contentModel.buildUserProfileArray(user.favorites)
+            recs = hybridModel.recommendWithScores(user.userId, userProfile, 10, exclude=user.favorites)
+            topMovieIds = recs.movieIds.tolist()
+            titles = resolver.resolve(topMovieIds)
 
+            # Content and collab columns are the normalized scores the hybrid score was blended from
             print("\n🎯 Top 10 Recommendations:")
             print(f"{'Rank':<5} {'Title':<40} {'Hybrid':>8} {'Content':>8} {'Collab':>8}")
             print("-" * 70)
-            for i, movieId in enumerate(topMovieIds, 1):
-                title = fetcher.getMovieTitle(movieId)
-                contentScore = contentModel.featureMatrix.loc[movieId] @ userProfile if movieId in contentModel.featureMatrix.index else 0
-                collabScore = collabModel.predictRating(user.userId, movieId) if movieId in collabModel.movieIdMapping else 0.0
-                contentNorm = (contentScore - blendedScores.min()) / (blendedScores.max() - blendedScores.min() + 1e-8)
-                collabNorm = (collabScore - blendedScores.min()) / (blendedScores.max() - blendedScores.min() + 1e-8)
-                hybridScore = blendedScores.get(movieId, 0)
-                print(f"{i:<5} {title:<40} {hybridScore:>8.3f} {contentNorm:>8.3f} {collabNorm:>8.3f}")
+            for i, movieId in enumerate(topMovieIds):
+                print(f"{i + 1:<5} {titles[movieId]:<40} {recs.blended[i]:>8.3f} {recs.contentNorm[i]:>8.3f} "
+                      f"{recs.collabNorm[i]:>8.3f}")
 
             print("\n👍👎 Which movies did you like from this list? Enter titles or press Enter to skip.")
             feedback_input = input("Liked: ").strip()
@@ -114,9 +117,9 @@ def run_demo():
 
             print("\n📝 Feedback Summary:")
             if liked_ids:
-                print("✅ Liked: " + " | ".join([fetcher.getMovieTitle(mid) for mid in sorted(all_liked_ids)]))
+                print("✅ Liked: " + " | ".join(resolver.resolve(sorted(all_liked_ids)).values()))
             if disliked_ids:
-                print("❌ Disliked: " + " | ".join([fetcher.getMovieTitle(mid) for mid in disliked_ids]))
+                print("❌ Disliked: " + " | ".join(resolver.resolve(list(disliked_ids)).values()))
 
             for movieId in liked_ids:
                 user_feedback_df = pd.concat([
@@ -124,17 +127,24 @@ def run_demo():
                     pd.DataFrame([{"userId": user.userId, "movieId": movieId, "rating": 5.0}])
                 ])
                 user.addFavorites([movieId])
+                user.addFeedback(movieId, 1)
 
             for movieId in disliked_ids:
+                user.addFeedback(movieId, 0)
                 user_feedback_df = pd.concat([
                     user_feedback_df,
                     pd.DataFrame([{"userId": user.userId, "movieId": movieId, "rating": 1.0}])
                 ])
 
+            store.put(user)
+            store.flush()
+
             # Retrain collaborative model
             augmented_ratings = pd.concat([ratingsDF, user_feedback_df], ignore_index=True)
             collabModel.trainModel(augmented_ratings)
 
+    resolver.wait(timeout=10)   # let background OMDb fetches finish writing the cache
+    store.close()
     print("\n📢 Thanks for trying the Movie Recommender Demo! Come back soon 🎬")
 
 if __name__ == "__main__":
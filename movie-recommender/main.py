@@ -3,58 +3,126 @@ from utils.dataLoader import IMDbLoader, MovieLensLoader, MetadataPreprocessor,
 from models.contentFilter import ContentBasedFilter
 from models.collabFilter import CollaborativeFilter
 from models.hybrid import HybridRecommender
+from models.popularity import PopularityModel
+from models.blendWeights import BlendWeightModel
 from utils.userProfile import UserProfile
 from utils.omdbFetcher import OmdbFetcher
+from utils.titleResolver import TitleResolver
 from utils.helpers import precisionAtK, recallAtK
+from utils.modelStore import saveModels, loadModels
+from utils.pipeline import Pipeline
+import argparse
+import os
+import numpy as np
 import pandas as pd
 
-# Load metadata and ratings from files
-def load_data():
-    imdb = IMDbLoader("ml-100k/links.csv", apiKey="766c1b0d")
-    metadata = imdb.loadMetadata()
-    metadata = imdb.preprocessMetadata()
+LINKS_PATH = "ml-100k/links.csv"
+OMDB_CACHE_PATH = "ml-100k/omdb_metadata.csv"
+RATINGS_PATH = "ml-100k/ratings.csv"
+MOVIES_PATH = "ml-100k/movies.csv"
 
-    movielens = MovieLensLoader("ml-100k/ratings.csv")
-    ratings = movielens.loadRatings()
+# Load OMDb metadata (from the local cache when present)
+def load_metadata():
+    imdb = IMDbLoader(LINKS_PATH, apiKey="766c1b0d", cachePath=OMDB_CACHE_PATH)
+    imdb.loadMetadata()
+    return imdb.preprocessMetadata()
 
-    return metadata, ratings
+# Load MovieLens ratings and movie list
+def load_ratings():
+    movielens = MovieLensLoader(RATINGS_PATH, MOVIES_PATH)
+    return movielens.loadRatings(), movielens.loadMovies()
 
-# Preprocess metadata into feature vectors, and binarize ratings
-def preprocess(metadata, ratings):
-    metaProc = MetadataPreprocessor(metadata)
+# Load metadata and ratings from files
+def load_data():
+    metadata = load_metadata()
+    ratings, movies = load_ratings()
+    return metadata, ratings, movies
+
+# Turn metadata into feature vectors keyed by movieId
+def build_features(metadata):
+    metaProc = MetadataPreprocessor(metadata, numWorkers=os.cpu_count())   # parallel only for large catalogues
     features = pd.concat([
         metaProc.encodeCategoricalFeatures(),    # One-hot encode genres, actors, directors
         metaProc.applyTfidfToPlots(),            # TF-IDF on plot summaries
         metaProc.normalizeVoteAverage()          # Normalize average rating
     ], axis=1)
+    features.index = metadata["movieId"].values   # Rows keyed by movieId, not position
+    return features.astype(np.float32)
 
-    binRatings = RatingsPreprocessor(ratings).binarizeRatings()  # Convert ratings to binary like/dislike
-    return features, binRatings
+# Convert ratings to binary like/dislike
+def binarize_ratings(ratings):
+    return RatingsPreprocessor(ratings).binarizeRatings()
 
-# Train all three models: content-based, collaborative, and hybrid
-def train_models(metadata, ratings, features):
+# Preprocess metadata into feature vectors, and binarize ratings
+def preprocess(metadata, ratings):
+    return build_features(metadata), binarize_ratings(ratings)
+
+def build_content(metadata, features):
     content = ContentBasedFilter(metadata)
     content.featureMatrix = features
-    content.movieIdToIndex = {mid: idx for idx, mid in enumerate(metadata["movieId"])}
+    return content
 
-    collab = CollaborativeFilter(numFactors=100)
+def train_collab(ratings, numFactors=100):
+    collab = CollaborativeFilter(numFactors=numFactors)
     collab.trainModel(ratings)
-
-    hybrid = HybridRecommender(content, collab, alpha=0.5)
+    return collab
+
+def fit_popularity(ratings, movies, metadata):
+    popularity = PopularityModel()
+    popularity.fit(ratings, movies, catalogIds=metadata["movieId"])
+    return popularity
+
+# Learn per-segment blend weights on held-out ratings, with a collab model that never saw them
+def fit_blend_weights(content, ratings, numFactors=100):
+    train, heldOut = RatingsPreprocessor(ratings).splitHoldout(fraction=0.2)
+    blendWeights = BlendWeightModel()
+    blendWeights.fit(HybridRecommender(content, train_collab(train, numFactors)), train, heldOut)
+    blendWeights.indexUsers(ratings)
+    return blendWeights
+
+# Train all three models: content-based, collaborative, and hybrid (plus cold-start fallback lists)
+def train_models(metadata, ratings, features, movies=None):
+    content = build_content(metadata, features)
+    collab = train_collab(ratings)
+    popularity = fit_popularity(ratings, movies, metadata)
+    blendWeights = fit_blend_weights(content, ratings)
+    hybrid = HybridRecommender(content, collab, alpha=0.5, popularityModel=popularity, blendWeights=blendWeights)
     return content, collab, hybrid
 
+# The load -> preprocess -> train steps as a checkpointed stage DAG. Feature building and the
+# collaborative / popularity / blend-weight fits only share the loaded data, so they run in parallel.
+# Model source files are listed as inputs so checkpointed objects are rebuilt when their class changes
+def build_pipeline(checkpointDir="checkpoints", numFactors=100):
+    pipeline = Pipeline(checkpointDir)
+    pipeline.add("metadata", load_metadata, inputs=[OMDB_CACHE_PATH, LINKS_PATH])
+    pipeline.add("ratings", load_ratings, inputs=[RATINGS_PATH, MOVIES_PATH])
+    pipeline.add("features", build_features, deps=["metadata"], inputs=["utils/dataLoader.py"])
+    pipeline.add("binRatings", lambda loaded: binarize_ratings(loaded[0]), deps=["ratings"],
+                 inputs=["utils/dataLoader.py"])
+    pipeline.add("content", build_content, deps=["metadata", "features"], checkpoint=False)
+    pipeline.add("collab", train_collab, deps=["binRatings"], params={"numFactors": numFactors},
+                 inputs=["models/collabFilter.py"])
+    pipeline.add("popularity", lambda binRatings, loaded, metadata: fit_popularity(binRatings, loaded[1], metadata),
+                 deps=["binRatings", "ratings", "metadata"], inputs=["models/popularity.py"])
+    pipeline.add("blendWeights", fit_blend_weights, deps=["content", "binRatings"], params={"numFactors": numFactors},
+                 inputs=["models/blendWeights.py", "models/hybrid.py", "models/collabFilter.py"])
+    return pipeline
+
 # Recommend top movies based on hybrid score
-def run_recommendation(user, content, collab, hybrid, topN=10):
-    fetcher = OmdbFetcher(apiKey="766c1b0d")
+def run_recommendation(user, content, collab, hybrid, topN=10, diversity=0.0):
+    resolver = TitleResolver(OmdbFetcher(apiKey="766c1b0d"))
     profile = content.buildUserProfile(user.favorites)
-    hybrid_scores = hybrid.blendScores(user.userId, profile)
 
     # Drop any favorites already seen by user
-    top_ids = hybrid_scores.drop(index=user.favorites, errors="ignore").sort_values(ascending=False).head(topN).index.tolist()
+    top_ids = hybrid.recommendMovies(user.userId, profile, topN, exclude=user.favorites,
+                                     diversity=diversity, favorites=user.favorites)
 
+    # Titles for the whole list at once; anything not cached locally is fetched in the background
+    titles = resolver.resolve(top_ids)
     print(f"\nTop {topN} recommendations:")
     for i, mid in enumerate(top_ids, 1):
-        print(f"{i}. {fetcher.getMovieTitle(mid)}")
+        print(f"{i}. {titles[mid]}")
+    resolver.wait(timeout=10)   # let background OMDb fetches finish writing the cache before exit
 
     return top_ids
 
@@ -63,19 +131,42 @@ def evaluate(recs, truth, k=5):
     print(f"\nPrecision@{k}: {precisionAtK(recs, truth, k):.3f}")
     print(f"Recall@{k}:    {recallAtK(recs, truth, k):.3f}")
 
-# Entry point for running the main model training and evaluation pipeline
-def main():
-    metadata, ratings = load_data()
-    features, binRatings = preprocess(metadata, ratings)
-    content, collab, hybrid = train_models(metadata, binRatings, features)
-
-    user = UserProfile(userId=1)
-    user.addFavorites([1, 32, 50, 1196, 1120])
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hybrid movie recommender")
+    parser.add_argument("--save-model", metavar="DIR", help="after training, save the models to DIR")
+    parser.add_argument("--from-model", metavar="DIR", help="skip training and recommend from a model saved in DIR")
+    parser.add_argument("--user", type=int, default=1, help="userId to recommend for")
+    parser.add_argument("--favorites", default="1,32,50,1196,1120", help="comma-separated favorite movieIds (empty for a new user)")
+    parser.add_argument("--top", type=int, default=10, help="number of recommendations")
+    parser.add_argument("--diversity", type=float, default=0.0, help="MMR trade-off in [0, 1); 0 keeps the raw ranking")
+    parser.add_argument("--checkpoints", default="checkpoints", metavar="DIR", help="where pipeline stage checkpoints are kept")
+    parser.add_argument("--force", action="store_true", help="ignore checkpoints and rerun every pipeline stage")
+    return parser.parse_args(argv)
 
-    recs = run_recommendation(user, content, collab, hybrid)
+# Entry point for running the main model training and evaluation pipeline
+def main(argv=None):
+    args = parse_args(argv)
+    user = UserProfile(userId=args.user)
+    user.addFavorites([int(mid) for mid in args.favorites.split(",") if mid.strip()])
+
+    # Serving from a saved model never loads ratings or imports the training stack
+    if args.from_model:
+        content, collab, hybrid = loadModels(args.from_model)
+        run_recommendation(user, content, collab, hybrid, topN=args.top, diversity=args.diversity)
+        return
+
+    pipeline = build_pipeline(args.checkpoints)
+    stages = pipeline.run(["content", "collab", "popularity", "blendWeights", "binRatings"], force=args.force)
+    content, collab, binRatings = stages["content"], stages["collab"], stages["binRatings"]
+    hybrid = HybridRecommender(content, collab, alpha=0.5, popularityModel=stages["popularity"],
+                               blendWeights=stages["blendWeights"])
+    if args.save_model:
+        saveModels(args.save_model, content, collab, hybrid)
+
+    recs = run_recommendation(user, content, collab, hybrid, topN=args.top, diversity=args.diversity)
     truth = binRatings[binRatings.userId == user.userId].movieId.tolist()
     evaluate(recs, truth)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from utils.helpers import minMaxScale
+from utils.idIndex import IdIndex
+
+# Per-segment blending weight learned offline. Users are bucketed by how many ratings the
+# collaborative model has seen from them, how many favorites they gave, and what share of
+# those favorites the content model knows; each segment gets the alpha that recovered the
+# most held-out likes. Serving is a bucket computation and a table lookup.
+class BlendWeightModel:
+    RATING_EDGES = np.array([1, 20, 50, 200])         # 0 | 1-19 | 20-49 | 50-199 | 200+
+    FAVORITE_EDGES = np.array([1, 3, 10])             # 0 | 1-2 | 3-9 | 10+
+    COVERAGE_EDGES = np.array([0.25, 0.75])           # <25% | 25-75% | 75%+
+
+    def __init__(self, alphaGrid=None, defaultAlpha: float = 0.5, minUsers: int = 5):
+        self.alphaGrid = np.linspace(0, 1, 11) if alphaGrid is None else np.asarray(alphaGrid, dtype=np.float64)
+        self.defaultAlpha = defaultAlpha
+        self.minUsers = minUsers                # smaller segments fall back to the global best alpha
+        numSegments = (len(self.RATING_EDGES) + 1) * (len(self.FAVORITE_EDGES) + 1) * (len(self.COVERAGE_EDGES) + 1)
+        self.alphaTable = np.full(numSegments, defaultAlpha, dtype=np.float32)
+        self.userIndex = IdIndex([])
+        self.userRatingCounts = np.empty(0, dtype=np.int32)
+
+    # Vectorized segment id for arrays of user features
+    def segmentOf(self, ratingCounts, favoriteCounts, coverage) -> np.ndarray:
+        r = np.searchsorted(self.RATING_EDGES, ratingCounts, side="right")
+        f = np.searchsorted(self.FAVORITE_EDGES, favoriteCounts, side="right")
+        c = np.searchsorted(self.COVERAGE_EDGES, coverage, side="right")
+        return (r * (len(self.FAVORITE_EDGES) + 1) + f) * (len(self.COVERAGE_EDGES) + 1) + c
+
+    # Remember how many ratings each user has, for serving-time lookups
+    def indexUsers(self, ratingsDF: pd.DataFrame) -> None:
+        userIds, counts = np.unique(ratingsDF["userId"].to_numpy(), return_counts=True)
+        self.userIndex = IdIndex(userIds)
+        self.userRatingCounts = counts.astype(np.int32)
+
+    def ratingCountOf(self, userId: int) -> int:
+        row = self.userIndex.rowOf(userId)
+        return int(self.userRatingCounts[row]) if row >= 0 else 0
+
+    # Serving: blend weight for a user with the given favorites (movieIds)
+    def lookup(self, userId: int, favoriteCount: int, knownFavorites: int) -> float:
+        coverage = knownFavorites / favoriteCount if favoriteCount else 0.0
+        return float(self.alphaTable[self.segmentOf(self.ratingCountOf(userId), knownFavorites, coverage)])
+
+    # Liked train ratings act as favorites; liked held-out ratings are the targets. hybrid's
+    # collaborative model must be trained on trainRatings only, or held-out likes leak into it
+    def fit(self, hybrid, trainRatings: pd.DataFrame, heldOutRatings: pd.DataFrame, k: int = 10,
+            likeThreshold: float = 3.5, batchSize: int = 512) -> None:
+        from scipy.sparse import csr_matrix
+
+        featureArray, movieIndex = hybrid.contentModel.getCore()
+        alignedFactors = hybrid._getAlignedFactors()
+        collab = hybrid.collabModel
+        self.indexUsers(trainRatings)
+
+        trainLikes = trainRatings[trainRatings["rating"] >= likeThreshold]
+        heldLikes = heldOutRatings[heldOutRatings["rating"] >= likeThreshold]
+        heldRows = movieIndex.rowsOf(heldLikes["movieId"].to_numpy())
+        users = np.unique(heldLikes["userId"].to_numpy()[heldRows >= 0])
+        if len(users) == 0:
+            return
+        userIndex = IdIndex(users)
+
+        # users x content-rows indicator matrices for favorites and held-out targets
+        favUsers = userIndex.rowsOf(trainLikes["userId"].to_numpy())
+        favRows = movieIndex.rowsOf(trainLikes["movieId"].to_numpy())
+        likedTotal = np.bincount(favUsers[favUsers >= 0], minlength=len(users))
+        keep = (favUsers >= 0) & (favRows >= 0)
+        favorites = csr_matrix((np.ones(keep.sum(), dtype=np.float32), (favUsers[keep], favRows[keep])),
+                               shape=(len(users), len(movieIndex)))
+        favorites.sum_duplicates()
+        favorites.data[:] = 1
+        targetUsers = userIndex.rowsOf(heldLikes["userId"].to_numpy())
+        keep = (targetUsers >= 0) & (heldRows >= 0)
+        targets = csr_matrix((np.ones(keep.sum(), dtype=np.float32), (targetUsers[keep], heldRows[keep])),
+                             shape=(len(users), len(movieIndex)))
+
+        knownFavorites = np.asarray(favorites.sum(axis=1)).ravel()
+        coverage = np.divide(knownFavorites, likedTotal, out=np.zeros(len(users)), where=likedTotal > 0)
+        segments = self.segmentOf([self.ratingCountOf(u) for u in users], knownFavorites, coverage)
+
+        hits = np.zeros((len(users), len(self.alphaGrid)))
+        for start in range(0, len(users), batchSize):
+            stop = min(start + batchSize, len(users))
+            favBatch = favorites[start:stop]
+            profiles = (favBatch @ featureArray) / np.maximum(knownFavorites[start:stop], 1)[:, None]
+            userRows = collab.userIndex.rowsOf(users[start:stop])
+            userVectors = np.zeros((stop - start, alignedFactors.shape[1]), dtype=np.float32)
+            userVectors[userRows >= 0] = collab.userFactors[userRows[userRows >= 0]]
+
+            contentScores = minMaxScale(np.asarray(profiles, dtype=np.float32) @ featureArray.T, axis=1)
+            collabScores = minMaxScale(userVectors @ alignedFactors.T, axis=1)
+            seen = favBatch.toarray() > 0
+            relevant = targets[start:stop].toarray() > 0
+            for a, alpha in enumerate(self.alphaGrid):
+                blended = alpha * contentScores + (1 - alpha) * collabScores
+                blended[seen] = -np.inf
+                top = np.argpartition(-blended, min(k, blended.shape[1] - 1), axis=1)[:, :k]
+                hits[start:stop, a] = np.take_along_axis(relevant, top, axis=1).sum(axis=1)
+
+        # Best alpha per segment by mean hits; thin segments take the global winner
+        globalAlpha = self.alphaGrid[int(np.argmax(hits.mean(axis=0)))]
+        self.alphaTable[:] = globalAlpha
+        segmentSizes = np.bincount(segments, minlength=len(self.alphaTable))
+        for segment in np.flatnonzero(segmentSizes >= self.minUsers):
+            self.alphaTable[segment] = self.alphaGrid[int(np.argmax(hits[segments == segment].mean(axis=0)))]
+
+        # Without any ratings the user's collab vector is zero and its scores are flat: use content only
+        noHistory = (len(self.FAVORITE_EDGES) + 1) * (len(self.COVERAGE_EDGES) + 1)
+        self.alphaTable[:noHistory] = 1.0
+
+    # Flat arrays for utils.modelStore
+    def getState(self) -> dict:
+        return {"alphaTable": self.alphaTable, "userIds": self.userIndex.ids, "userRatingCounts": self.userRatingCounts}
+
+    def setState(self, state: dict) -> None:
+        self.alphaTable = state["alphaTable"]
+        self.userIndex = IdIndex(state["userIds"])
+        self.userRatingCounts = state["userRatingCounts"]
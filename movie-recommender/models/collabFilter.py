@@ -1,76 +1,135 @@
 import pandas as pd
 import numpy as np
-from sklearn.decomposition import TruncatedSVD
-from utils.omdbFetcher import OmdbFetcher
+from utils.idIndex import IdIndex
+from utils.helpers import topKIndices
 from typing import List
 
 class CollaborativeFilter:
-    def __init__(self, numFactors: int = 30, metadataDF: pd.DataFrame = None):
+    def __init__(self, numFactors: int = 30, metadataDF: pd.DataFrame = None, linksPath: str = "ml-100k/links.csv",
+                 dtype=np.float32, userIndex: IdIndex = None, movieIndex: IdIndex = None):
         self.numFactors = numFactors
+        self.dtype = np.dtype(dtype)  # storage precision of userFactors / movieFactors
+        self.userIndex = userIndex if userIndex is not None else IdIndex()     # userId <-> row of userFactors
+        self.movieIndex = movieIndex if movieIndex is not None else IdIndex()  # movieId <-> row of movieFactors
         self.metadataDF = metadataDF  # Movie metadata (movies, titles, etc.)
-        self.linksDF = pd.read_csv("ml-100k/links.csv")  # Mapping of movieId to imdbId 
+        self.movieFactors = np.zeros((0, numFactors), dtype=self.dtype)
+        self.linksPath = linksPath
+        self._linksDF = None
+        self._userBuffer = np.zeros((0, numFactors), dtype=self.dtype)   # userFactors plus spare zero rows
+
+    # User factor rows in use: a view of the preallocated buffer, one row per userIndex entry
+    @property
+    def userFactors(self) -> np.ndarray:
+        self.syncRows()
+        return self._userBuffer[:len(self.userIndex)]
+
+    # Mapping of movieId to imdbId, read on first use
+    @property
+    def linksDF(self) -> pd.DataFrame:
+        if self._linksDF is None:
+            self._linksDF = pd.read_csv(self.linksPath)
+        return self._linksDF
 
     # Create a matrix of users and movies based on ratings
     def trainModel(self, ratingsDF: pd.DataFrame) -> None:
-       
-        # Rows: users, Columns: movies, Values: ratings
-        self.interactionMatrix = ratingsDF.pivot_table(index="userId", columns="movieId", values="rating").fillna(0)
-
-        # Create a mapping from userId/movieId to matrix indices
-        self.userIdMapping = {uid: idx for idx, uid in enumerate(self.interactionMatrix.index)}
-        self.movieIdMapping = {mid: idx for idx, mid in enumerate(self.interactionMatrix.columns)}
-        
+        from sklearn.decomposition import TruncatedSVD
+
+        # Rows: users, Columns: movies, Values: ratings. Kept local: only the factors outlive training,
+        # so pickled models (pipeline checkpoints) stay the size of the factors
+        interactionMatrix = ratingsDF.pivot_table(index="userId", columns="movieId", values="rating").fillna(0)
+
         #Apply Singular Value Decomposition (SVD) to reduce dimensions
         svd = TruncatedSVD(n_components=self.numFactors, random_state=42)
-        reducedMatrix = svd.fit_transform(self.interactionMatrix)
+        reducedMatrix = svd.fit_transform(interactionMatrix)
+
+        # Store the reduced matrices for users (rows) and movies (components)
+        self.setFactors(interactionMatrix.index.to_numpy(), interactionMatrix.columns.to_numpy(),
+                        reducedMatrix, svd.components_.T)
+
+    # Install trained factors, either straight from trainModel or from a saved artifact. Ids go
+    # through the (possibly shared) encoders, so users and movies keep their rows across retrains;
+    # rows of ids missing from this training stay zero
+    def setFactors(self, userIds, movieIds, userFactors: np.ndarray, movieFactors: np.ndarray) -> None:
+        userRows = self.userIndex.add(userIds)
+        movieRows = self.movieIndex.add(movieIds)
+        self._userBuffer = self._placeRows(userFactors, userRows, len(self.userIndex))  # Matrix with user factor representations
+        self.movieFactors = self._placeRows(movieFactors, movieRows, len(self.movieIndex))  # Matrix with movie factor representations
+
+        # Compact scoring copy: float32 movie factors (the same array when stored as float32)
+        self.movieFactorArray = np.ascontiguousarray(self.movieFactors, dtype=np.float32)
+
+    # Factor rows laid out by encoder row; a plain contiguous copy when rows are already 0..n-1
+    def _placeRows(self, factors: np.ndarray, rows: np.ndarray, numRows: int) -> np.ndarray:
+        if numRows == len(rows) and np.array_equal(rows, np.arange(numRows)):
+            return np.ascontiguousarray(factors, dtype=self.dtype)
+        placed = np.zeros((numRows, factors.shape[1]), dtype=self.dtype)
+        placed[rows] = factors
+        return placed
+
+    # Rows of many users at once, adding zero rows for unseen ones
+    def addUsers(self, userIds) -> np.ndarray:
+        rows = self.userIndex.add(userIds)
+        self.syncRows()
+        return rows
+
+    # Zero rows for ids another model added to a shared encoder since our factors were set. The
+    # user buffer grows geometrically, so new users cost amortized O(1) rows of copying
+    def syncRows(self) -> None:
+        needed = len(self.userIndex)
+        if needed > len(self._userBuffer):
+            grown = np.zeros((max(needed, 2 * len(self._userBuffer)), self._userBuffer.shape[1]), dtype=self.dtype)
+            grown[:len(self._userBuffer)] = self._userBuffer
+            self._userBuffer = grown
+        if len(self.movieIndex) > len(self.movieFactors):
+            padded = np.zeros((len(self.movieIndex), self.movieFactors.shape[1]), dtype=self.dtype)
+            padded[:len(self.movieFactors)] = self.movieFactors
+            self.movieFactors = padded
+            self.movieFactorArray = np.ascontiguousarray(padded, dtype=np.float32)
+
+    # Row of a user in userFactors, adding a zero row for cold-start users
+    def _userRow(self, userId: int) -> int:
+        row = self.userIndex.rowOf(userId)
+        if row < 0:
+            row = int(self.addUsers([userId])[0])
+        elif row >= len(self._userBuffer):
+            self.syncRows()
+        return row
+
+    # Row of a movie in movieFactors, or -1 for unknown movies
+    def _movieRow(self, movieId: int) -> int:
+        row = self.movieIndex.rowOf(movieId)
+        if row >= len(self.movieFactors):
+            self.syncRows()
+        return row
+
+    # Latent vector for a user as float32
+    def getUserVector(self, userId: int) -> np.ndarray:
+        row = self._userRow(userId)  # may grow the user buffer, so look it up first
+        return self._userBuffer[row].astype(np.float32)
 
-        # Store the reduced matrices for users and movies
-        self.userFactors = reducedMatrix  # Matrix with user factor representations
-        self.movieFactors = svd.components_.T  # Matrix with movie factor representations
-    
     # Predict the rating for a given user and movie
     def predictRating(self, userId: int, movieId: int) -> float:
-        # Handle cold-start users
-        if userId not in self.userIdMapping:
-            newIndex = len(self.userFactors)
-            self.userIdMapping[userId] = newIndex
-            newVec = np.zeros(self.userFactors.shape[1])
-            self.userFactors = np.vstack([self.userFactors, newVec])
-
-        if movieId not in self.movieIdMapping:
+        uIdx = self._userRow(userId)  # Handle cold-start users
+        mIdx = self._movieRow(movieId)
+        if mIdx < 0:
             return 0.0
-
-        uIdx = self.userIdMapping[userId]
-        mIdx = self.movieIdMapping[movieId]
-        return np.dot(self.userFactors[uIdx], self.movieFactors[mIdx])
-
+        return np.dot(self._userBuffer[uIdx], self.movieFactors[mIdx])
 
     def recommendMovies(self, userId: int, topN: int = 10) -> List[int]:
         # Get the user’s factor vector and compute similarity with all movies
-        uIdx = self.userIdMapping[userId]
-        scores = self.userFactors[uIdx] @ self.movieFactors.T  # Dot product to calculate movie scores
+        scores = self.movieFactorArray @ self.getUserVector(userId)  # Dot product to calculate movie scores
 
-        # Get the top N movie indices based on the scores
-        topIndices = np.argsort(scores)[-topN:][::-1]
-        
-        # Convert the movie indices back to movieIds using the movieId mapping
-        movieIdxToId = {idx: mid for mid, idx in self.movieIdMapping.items()}
-        topMovieIds = [movieIdxToId[i] for i in topIndices]
-        return topMovieIds
+        # Convert the top N movie rows back to movieIds
+        return self.movieIndex.decode(topKIndices(scores, topN)).tolist()
 
     # Update the user’s vector based on their feedback (like/dislike)
     def updateUserVector(self, userId: int, movieId: int, feedback: int) -> None:
-        if userId not in self.userIdMapping:
-            self.userIdMapping[userId] = len(self.userFactors)
-            newUserVector = np.zeros(self.userFactors.shape[1])
-            self.userFactors = np.vstack([self.userFactors, newUserVector])
-
-        uIdx = self.userIdMapping[userId]
-        mIdx = self.movieIdMapping.get(movieId)
-        if mIdx is None:
+        uIdx = self._userRow(userId)
+        mIdx = self._movieRow(movieId)
+        if mIdx < 0:
             return
 
-        currentVector = self.userFactors[uIdx]
+        currentVector = self._userBuffer[uIdx]
         movieVector = self.movieFactors[mIdx]
         error = feedback - np.dot(currentVector, movieVector)
-        self.userFactors[uIdx] += 0.1 * error * movieVector
\ No newline at end of file
+        self._userBuffer[uIdx] += 0.1 * error * movieVector
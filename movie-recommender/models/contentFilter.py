@@ -1,14 +1,17 @@
 import pandas as pd
 import numpy as np
 from typing import List
-from sklearn.metrics.pairwise import cosine_similarity
-from utils.helpers import normalizeVectors
+from utils.helpers import normalizeVectors, topKIndices
+from utils.idIndex import IdIndex
 
 class ContentBasedFilter:
     def __init__(self, metadataDF: pd.DataFrame):
         self.metadataDF = metadataDF
         self.featureMatrix = None
-        self.movieIdToIndex = {}
+        self.featureArray = None        # float32 copy of featureMatrix used for scoring
+        self.featureNorms = None
+        self.movieIndex = None          # movieId <-> row of featureArray
+        self._coreSource = None
 
     # Build feature matrix from metadata (genres, directors, actors, plot, voteAvg)
     def buildFeatureMatrix(self) -> None:
@@ -32,29 +35,48 @@ class ContentBasedFilter:
         voteAvg = normalizeVectors(self.metadataDF[["voteAverage"]])
         voteAvg.columns = ["voteAvgScaled"]
 
-        self.featureMatrix = pd.concat([genresDF, directorsDF, actorsDF, plotDF, voteAvg], axis=1)
+        self.featureMatrix = pd.concat([genresDF, directorsDF, actorsDF, plotDF, voteAvg], axis=1).astype(np.float32)
         self.featureMatrix.index = self.metadataDF["movieId"]
-        self.movieIdToIndex = {mid: idx for idx, mid in enumerate(self.metadataDF["movieId"])}
+
+    # Compact NumPy view of featureMatrix, rebuilt only when featureMatrix is replaced
+    def getCore(self):
+        if self._coreSource is not self.featureMatrix:
+            self.featureArray = np.ascontiguousarray(self.featureMatrix.to_numpy(dtype=np.float32))
+            self.featureNorms = np.linalg.norm(self.featureArray, axis=1)
+            self.movieIndex = IdIndex(self.featureMatrix.index.to_numpy())
+            self._coreSource = self.featureMatrix
+        return self.featureArray, self.movieIndex
+
+    # Average the feature rows of favorite movies (NumPy only)
+    def buildUserProfileArray(self, favoriteMovieIds: List[int]) -> np.ndarray:
+        featureArray, movieIndex = self.getCore()
+        rows = movieIndex.rowsOf(favoriteMovieIds)
+        rows = rows[rows >= 0]
+        if len(rows) == 0:
+            return np.zeros(featureArray.shape[1], dtype=np.float32)
+        return featureArray[rows].mean(axis=0)
 
     # Average the vectors of favorite movies to form a user profile
     def buildUserProfile(self, favoriteMovieIds: List[int]) -> pd.Series:
-        validIds = [mid for mid in favoriteMovieIds if mid in self.featureMatrix.index]
-        if not validIds:
-            return pd.Series(np.zeros(self.featureMatrix.shape[1]), index=self.featureMatrix.columns)
-        return self.featureMatrix.loc[validIds].mean()
+        return pd.Series(self.buildUserProfileArray(favoriteMovieIds), index=self.featureMatrix.columns)
 
     # Recommend movies by comparing user profile to all movies
     def recommendMovies(self, userProfile: pd.Series, topN: int = 10) -> List[int]:
-        sims = cosine_similarity([userProfile], self.featureMatrix)[0]
-        topIndices = np.argsort(sims)[-topN:][::-1]
-        return self.featureMatrix.index[topIndices].tolist()
+        featureArray, movieIndex = self.getCore()
+        profile = np.asarray(userProfile, dtype=np.float32)
+        denom = self.featureNorms * np.linalg.norm(profile)
+        sims = np.divide(featureArray @ profile, denom, out=np.zeros(len(denom), dtype=np.float32), where=denom > 0)
+        return movieIndex.ids[topKIndices(sims, topN)].tolist()
 
-    # Update user profile with new feedback (like/dislike)
-    def updateUserProfile(self, userProfile: pd.Series, movieId: int, feedback: int) -> pd.Series:
-        if movieId not in self.featureMatrix.index:
+    # Update user profile with new feedback (like/dislike), in place. Works on the pd.Series
+    # profile or its NumPy array form; the movie row comes from the float32 core
+    def updateUserProfile(self, userProfile, movieId: int, feedback: int):
+        featureArray, movieIndex = self.getCore()
+        row = movieIndex.rowOf(movieId)
+        if row < 0:
             return userProfile
 
-        movieVector = self.featureMatrix.loc[movieId]
+        movieVector = featureArray[row]
         alpha = 0.1  # learning rate
         if feedback == 1:
             userProfile += alpha * (movieVector - userProfile)
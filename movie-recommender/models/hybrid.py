@@ -1,43 +1,166 @@
 from typing import List
 import pandas as pd
 import numpy as np
+from utils.helpers import minMaxScale, topKIndices
+
+# Top-N of one request with the scores that ranked it, every array aligned with movieIds.
+# Normalized scores use the (min, max) of the ranking pass itself, so for each row
+# blended == alpha * contentNorm + (1 - alpha) * collabNorm. Popularity (cold-start) answers
+# carry ids only, with NaN scores and alpha None
+class ScoredRecommendations:
+    def __init__(self, movieIds: np.ndarray, blended: np.ndarray = None, contentRaw: np.ndarray = None,
+                 contentNorm: np.ndarray = None, collabRaw: np.ndarray = None, collabNorm: np.ndarray = None,
+                 alpha: float = None):
+        self.movieIds = np.asarray(movieIds, dtype=np.int32)
+        missing = np.full(len(self.movieIds), np.nan, dtype=np.float32)
+        self.blended = missing if blended is None else blended
+        self.contentRaw = missing if contentRaw is None else contentRaw      # profile . features
+        self.contentNorm = missing if contentNorm is None else contentNorm
+        self.collabRaw = missing if collabRaw is None else collabRaw        # user factors . movie factors
+        self.collabNorm = missing if collabNorm is None else collabNorm
+        self.alpha = alpha
+
+    def __len__(self) -> int:
+        return len(self.movieIds)
+
+    def toFrame(self) -> pd.DataFrame:
+        return pd.DataFrame({"blended": self.blended, "contentRaw": self.contentRaw, "contentNorm": self.contentNorm,
+                             "collabRaw": self.collabRaw, "collabNorm": self.collabNorm},
+                            index=pd.Index(self.movieIds, name="movieId"))
 
 class HybridRecommender:
-    def __init__(self, contentModel, collabModel, alpha: float = 0.5):
+    def __init__(self, contentModel, collabModel, alpha: float = 0.5, popularityModel=None, blendWeights=None):
         self.contentModel = contentModel
         self.collabModel = collabModel
         self.alpha = alpha
+        self.popularityModel = popularityModel   # precomputed fallback lists for cold-start users
+        self.blendWeights = blendWeights         # learned per-segment alpha (models.blendWeights)
+        self._alignedFactors = None     # collab movie factors reordered to content rows
+        self._alignedSource = None
+
+    # Collaborative movie factors laid out in content-row order (zero rows for unknown movies)
+    def _getAlignedFactors(self) -> np.ndarray:
+        self.collabModel.syncRows()     # a shared movie encoder may have grown since the factors were set
+        featureArray, movieIndex = self.contentModel.getCore()
+        source = (featureArray, self.collabModel.movieFactorArray)
+        if self._alignedSource is None or any(a is not b for a, b in zip(source, self._alignedSource)):
+            collabRows = self.collabModel.movieIndex.rowsOf(movieIndex.ids)
+            aligned = np.zeros((len(movieIndex), self.collabModel.movieFactorArray.shape[1]), dtype=np.float32)
+            known = collabRows >= 0
+            aligned[known] = self.collabModel.movieFactorArray[collabRows[known]]
+            self._alignedFactors = aligned
+            self._alignedSource = source
+        return self._alignedFactors
+
+    # Blend weight for this request: learned per-segment alpha when favorites are known, else global alpha
+    def alphaFor(self, userId: int, favorites: List[int] = None) -> float:
+        if self.blendWeights is None or favorites is None:
+            return self.alpha
+        knownFavorites = int(np.count_nonzero(self.contentModel.movieIndex.rowsOf(favorites) >= 0))
+        return self.blendWeights.lookup(userId, len(favorites), knownFavorites)
+
+    # Blended scores aligned with contentModel.movieIndex rows (NumPy only)
+    def blendArray(self, userId: int, userProfile, favorites: List[int] = None) -> np.ndarray:
+        return self._blendParts(userId, userProfile, favorites)[0]
+
+    # One scoring pass: blended scores plus the raw score arrays, their (min, max) and alpha
+    def _blendParts(self, userId: int, userProfile, favorites: List[int] = None) -> tuple:
+        featureArray, _ = self.contentModel.getCore()
+        profile = np.ascontiguousarray(userProfile, dtype=np.float32)
+        userVector = self.collabModel.getUserVector(userId)
+        alpha = self.alphaFor(userId, favorites)
+
+        contentRaw = featureArray @ profile
+        collabRaw = self._getAlignedFactors() @ userVector
+        contentLow, contentHigh = contentStats = (contentRaw.min(), contentRaw.max())
+        collabLow, collabHigh = collabStats = (collabRaw.min(), collabRaw.max())
+        blended = (alpha * ((contentRaw - contentLow) / (contentHigh - contentLow + 1e-8))
+                   + (1 - alpha) * ((collabRaw - collabLow) / (collabHigh - collabLow + 1e-8)))
+        parts = {"alpha": alpha, "contentRaw": contentRaw, "contentStats": contentStats,
+                 "collabRaw": collabRaw, "collabStats": collabStats}
+        return blended, parts
+
+    # Blended scores for many users in one pass: row i belongs to (userIds[i], userProfiles[i])
+    def blendBatch(self, userIds: List[int], userProfiles) -> np.ndarray:
+        featureArray, _ = self.contentModel.getCore()
+        contentScores = np.asarray(userProfiles, dtype=np.float32) @ featureArray.T
+        userVectors = np.stack([self.collabModel.getUserVector(uid) for uid in userIds])
+        collabScores = userVectors @ self._getAlignedFactors().T
+        return self.alpha * minMaxScale(contentScores, axis=1) + (1 - self.alpha) * minMaxScale(collabScores, axis=1)
 
     def blendScores(self, userId: int, userProfile: pd.Series) -> pd.Series:
-        contentScores = pd.Series(
-            self.contentModel.featureMatrix @ userProfile,
-            index=self.contentModel.featureMatrix.index
-        )
+        blended = self.blendArray(userId, userProfile)
+        return pd.Series(blended, index=self.contentModel.featureMatrix.index)
+
+    # No favorites and no collaborative history: blending would only rank noise
+    def isColdStart(self, userId: int, userProfile) -> bool:
+        if np.any(np.asarray(userProfile)):
+            return False
+        uIdx = self.collabModel.userIndex.rowOf(userId)
+        return uIdx < 0 or not np.any(self.collabModel.userFactors[uIdx])
+
+    # Answer from the precomputed popularity lists without touching any factor matrix
+    def recommendColdStart(self, topN: int = 10, genre: str = None, exclude: List[int] = None) -> List[int]:
+        return self.popularityModel.recommend(topN, genre=genre, exclude=exclude)
 
-        collabScores = {}
-        for movieId in self.contentModel.featureMatrix.index:
-            if movieId in self.collabModel.movieIdMapping:
-                score = self.collabModel.predictRating(userId, movieId)
-                collabScores[movieId] = score
-            else:
-                collabScores[movieId] = 0.0  # fallback or ignore
+    # Maximal marginal relevance over the best `poolSize` rows: each pick trades blended score
+    # against content similarity to what is already picked. Similarities are computed one picked
+    # row at a time against the pool, so the cost is O(topN * poolSize * features)
+    def rerankDiverse(self, blended: np.ndarray, topN: int = 10, diversity: float = 0.3,
+                      poolSize: int = 100, excludeRows: np.ndarray = None) -> np.ndarray:
+        featureArray, _ = self.contentModel.getCore()
+        pool = topKIndices(blended, max(poolSize, topN), excludeRows)
+        norms = self.contentModel.featureNorms[pool]
+        unitVectors = featureArray[pool] / np.where(norms > 0, norms, 1)[:, None]
 
-        collabScores = pd.Series(collabScores)
+        relevance = (1 - diversity) * blended[pool]
+        maxSimilarity = np.zeros(len(pool), dtype=np.float32)
+        available = np.ones(len(pool), dtype=bool)
+        picked = []
+        for _ in range(min(topN, len(pool))):
+            mmr = np.where(available, relevance - diversity * maxSimilarity, -np.inf)
+            best = int(np.argmax(mmr))
+            picked.append(best)
+            available[best] = False
+            np.maximum(maxSimilarity, unitVectors @ unitVectors[best], out=maxSimilarity)
+        return pool[picked]
 
-        # Normalize both
-        contentScores = (contentScores - contentScores.min()) / (contentScores.max() - contentScores.min() + 1e-8)
-        collabScores = (collabScores - collabScores.min()) / (collabScores.max() - collabScores.min() + 1e-8)
+    # Recommend top-N movieIds, optionally skipping movies the user already has.
+    # diversity > 0 re-ranks a candidate pool with MMR instead of taking the raw top-N;
+    # passing favorites lets a learned blendWeights model pick alpha for this user
+    def recommendMovies(self, userId: int, userProfile: pd.Series, topN: int = 10, exclude: List[int] = None,
+                        diversity: float = 0.0, poolSize: int = 100, favorites: List[int] = None) -> List[int]:
+        return self.recommendWithScores(userId, userProfile, topN, exclude, diversity, poolSize, favorites).movieIds.tolist()
 
-        blended = self.alpha * contentScores + (1 - self.alpha) * collabScores
-        return blended
+    # Same ranking as recommendMovies, returned with the raw and normalized content, collab and
+    # blended scores of each pick, gathered from the scoring pass that ranked them
+    def recommendWithScores(self, userId: int, userProfile, topN: int = 10, exclude: List[int] = None,
+                            diversity: float = 0.0, poolSize: int = 100,
+                            favorites: List[int] = None) -> ScoredRecommendations:
+        if self.popularityModel is not None and self.isColdStart(userId, userProfile):
+            return ScoredRecommendations(self.recommendColdStart(topN, exclude=exclude))
 
+        blended, parts = self._blendParts(userId, userProfile, favorites)
+        movieIndex = self.contentModel.movieIndex
+        excludeRows = None
+        if exclude:
+            excludeRows = movieIndex.rowsOf(exclude)
+            excludeRows = excludeRows[excludeRows >= 0]
+        if diversity > 0:
+            rows = self.rerankDiverse(blended, topN, diversity, poolSize, excludeRows)
+        else:
+            rows = topKIndices(blended, topN, excludeRows)
 
-    # Recommend top-N movieIds
-    def recommendMovies(self, userId: int, userProfile: pd.Series, topN: int = 10) -> List[int]:
-        blendedScores = self.blendScores(userId, userProfile)
-        topMovieIds = blendedScores.sort_values(ascending=False).head(topN).index.tolist()
-        return topMovieIds
+        alpha = parts["alpha"]
+        contentLow, contentHigh = parts["contentStats"]
+        collabLow, collabHigh = parts["collabStats"]
+        contentRaw, collabRaw = parts["contentRaw"][rows], parts["collabRaw"][rows]
+        return ScoredRecommendations(
+            movieIndex.ids[rows], blended=blended[rows],
+            contentRaw=contentRaw, contentNorm=(contentRaw - contentLow) / (contentHigh - contentLow + 1e-8),
+            collabRaw=collabRaw, collabNorm=(collabRaw - collabLow) / (collabHigh - collabLow + 1e-8),
+            alpha=alpha)
 
     # Update alpha (e.g. for cold-start handling)
     def updateAlpha(self, newAlpha: float) -> None:
-        self.alpha = newAlpha
\ No newline at end of file
+        self.alpha = newAlpha
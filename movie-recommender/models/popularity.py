@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+from typing import List
+
+# Precomputed fallback lists for users with no history: most rated, best Bayesian-average rating,
+# and best per genre. Built once from ratings; answering a request just walks a short list
+class PopularityModel:
+    def __init__(self, listSize: int = 200, priorVotes: float = 10.0):
+        self.listSize = listSize            # how many movies each fallback list keeps
+        self.priorVotes = priorVotes        # weight of the global mean in the Bayesian average
+        self.popularIds = None              # most rated first
+        self.bayesIds = None                # highest Bayesian-average rating first
+        self.genreNames = None
+        self.genreOffsets = None            # genre g owns genreMovieIds[genreOffsets[g]:genreOffsets[g + 1]]
+        self.genreMovieIds = None
+
+    # One vectorized pass over ratings: per-movie counts and sums via bincount
+    def fit(self, ratingsDF: pd.DataFrame, moviesDF: pd.DataFrame = None, catalogIds=None) -> None:
+        movieIds, inverse = np.unique(ratingsDF["movieId"].to_numpy(), return_inverse=True)
+        ratings = ratingsDF["rating"].to_numpy(dtype=np.float64)
+        counts = np.bincount(inverse, minlength=len(movieIds)).astype(np.float64)
+        sums = np.bincount(inverse, weights=ratings, minlength=len(movieIds))
+        bayes = (self.priorVotes * ratings.mean() + sums) / (counts + self.priorVotes)
+
+        # Only recommend what the caller can serve (e.g. movies with content metadata)
+        if catalogIds is not None:
+            keep = np.isin(movieIds, np.asarray(catalogIds))
+            movieIds, counts, bayes = movieIds[keep], counts[keep], bayes[keep]
+
+        self.popularIds = movieIds[self._topRows(counts, bayes)].astype(np.int32)
+        self.bayesIds = movieIds[self._topRows(bayes, counts)].astype(np.int32)
+        if moviesDF is not None:
+            self._fitGenres(moviesDF, movieIds, bayes, counts)
+
+    # Per-genre top lists, stored CSR-style so they serialize as three flat arrays
+    def _fitGenres(self, moviesDF: pd.DataFrame, movieIds: np.ndarray, bayes: np.ndarray, counts: np.ndarray) -> None:
+        genres = moviesDF[["movieId", "genres"]].assign(genre=moviesDF["genres"].str.split("|")).explode("genre")
+        genres = genres[genres["genre"] != "(no genres listed)"]
+        rows = np.searchsorted(movieIds, genres["movieId"].to_numpy())
+        rows = np.minimum(rows, len(movieIds) - 1)
+        rated = movieIds[rows] == genres["movieId"].to_numpy()
+        rows = rows[rated]
+        self.genreNames, genreCodes = np.unique(genres["genre"].to_numpy()[rated].astype(str), return_inverse=True)
+
+        # Sort by genre, then best score first; keep the first listSize entries of each genre
+        order = np.lexsort((-counts[rows], -bayes[rows], genreCodes))
+        sortedCodes = genreCodes[order]
+        rank = np.arange(len(order)) - np.searchsorted(sortedCodes, sortedCodes)
+        keep = order[rank < self.listSize]
+        self.genreMovieIds = movieIds[rows[keep]].astype(np.int32)
+        self.genreOffsets = np.searchsorted(genreCodes[keep], np.arange(len(self.genreNames) + 1)).astype(np.int64)
+
+    # Row order by score descending (ties broken by tieBreak descending), truncated to listSize
+    def _topRows(self, score: np.ndarray, tieBreak: np.ndarray) -> np.ndarray:
+        return np.lexsort((-tieBreak, -score))[:self.listSize]
+
+    def getGenreList(self, genre: str) -> np.ndarray:
+        if self.genreNames is None:
+            return np.empty(0, dtype=np.int32)
+        g = np.searchsorted(self.genreNames, genre)
+        if g >= len(self.genreNames) or self.genreNames[g] != genre:
+            return np.empty(0, dtype=np.int32)
+        return self.genreMovieIds[self.genreOffsets[g]:self.genreOffsets[g + 1]]
+
+    # Top-N from a precomputed list, skipping excluded ids: O(N + len(exclude))
+    def recommend(self, topN: int = 10, genre: str = None, exclude: List[int] = None, byRating: bool = True) -> List[int]:
+        if genre is not None:
+            candidates = self.getGenreList(genre)
+        else:
+            candidates = self.bayesIds if byRating else self.popularIds
+        excluded = set(exclude or ())
+        result = []
+        for movieId in candidates:
+            if movieId not in excluded:
+                result.append(int(movieId))
+                if len(result) == topN:
+                    break
+        return result
+
+    # Flat arrays for utils.modelStore
+    def getState(self) -> dict:
+        state = {"popularIds": self.popularIds, "bayesIds": self.bayesIds}
+        if self.genreNames is not None:
+            state.update(genreNames=self.genreNames, genreOffsets=self.genreOffsets, genreMovieIds=self.genreMovieIds)
+        return state
+
+    def setState(self, state: dict) -> None:
+        self.popularIds = state["popularIds"]
+        self.bayesIds = state["bayesIds"]
+        self.genreNames = state.get("genreNames")
+        self.genreOffsets = state.get("genreOffsets")
+        self.genreMovieIds = state.get("genreMovieIds")
@@ -7,6 +7,7 @@ from models.hybrid import HybridRecommender
 from utils.userProfile import UserProfile
 from tests.dataTester import DataTester
 from utils.omdbFetcher import OmdbFetcher
+from utils.idIndex import IdIndex
 
 class CollaborativeFilterTester:
     def __init__(self, userProfile: UserProfile, ratingsDF: pd.DataFrame, metadataDF: pd.DataFrame, fetcher: OmdbFetcher):
@@ -93,7 +94,33 @@ class HybridFilterTester:
         row = self.metadataDF[self.metadataDF["movieId"] == movieId]
         return row["title"].values[0] if not row.empty else "Unknown"
 
+# Two collaborative models on one pair of encoders: ids one model adds must read as zero rows
+# in the other, never as an out-of-range row
+class SharedIndexTester:
+    def run(self):
+        print("\n Running SharedIndexTester...\n")
+        userIndex, movieIndex = IdIndex(), IdIndex()
+        modelA = CollaborativeFilter(numFactors=2, userIndex=userIndex, movieIndex=movieIndex)
+        modelB = CollaborativeFilter(numFactors=2, userIndex=userIndex, movieIndex=movieIndex)
+        modelA.setFactors([1, 2], [10, 20], np.ones((2, 2)), np.ones((2, 2)))
+        modelB.setFactors([1, 2], [10, 20], np.ones((2, 2)), np.ones((2, 2)))
+
+        modelA.getUserVector(3)                                              # A grows the user encoder
+        modelA.setFactors([1], [30], np.ones((1, 2)), np.ones((1, 2)))       # A retrains on a new movie
+        checks = {
+            "B.getUserVector(3) is zero": not np.any(modelB.getUserVector(3)),
+            "B.predictRating(3, 10) is 0": modelB.predictRating(3, 10) == 0,
+            "B.predictRating(1, 30) is 0": modelB.predictRating(1, 30) == 0,
+            "B.predictRating(1, 10) kept": modelB.predictRating(1, 10) == 2,
+            "B.userFactors covers the encoder": len(modelB.userFactors) == len(userIndex),
+        }
+        for name, ok in checks.items():
+            print(f" {'✅' if ok else '❌'} {name}")
+        return checks
+
 if __name__ == "__main__":
+    SharedIndexTester().run()
+
     dataOutputs = DataTester().run()
     ratingsDF = dataOutputs["binaryRatings"]
     metadataDF = dataOutputs["metadata"]
@@ -112,7 +139,6 @@ if __name__ == "__main__":
     # Run content-based test
     contentModel = ContentBasedFilter(metadataDF)
     contentModel.featureMatrix = featureMatrix
-    contentModel.movieIdToIndex = {mid: idx for idx, mid in enumerate(metadataDF["movieId"])}
     contentTester = ContentBasedFilterTester(userProfile, contentModel, metadataDF)
     contentTester.run()
 
@@ -1,7 +1,6 @@
 import os
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MultiLabelBinarizer
-from sklearn.feature_extraction.text import TfidfVectorizer
 from utils.helpers import normalizeVectors
 from utils.omdbFetcher import OmdbFetcher
 
@@ -43,18 +42,42 @@ class IMDbLoader:
 
 # Load MovieLens ratings
 class MovieLensLoader:
-    def __init__(self, ratingsPath: str):
+    def __init__(self, ratingsPath: str, moviesPath: str = "ml-100k/movies.csv"):
         self.ratingsPath = ratingsPath
+        self.moviesPath = moviesPath
 
     def loadRatings(self) -> pd.DataFrame:
         return pd.read_csv(self.ratingsPath)
 
+    # movieId, title and pipe-separated genres
+    def loadMovies(self) -> pd.DataFrame:
+        return pd.read_csv(self.moviesPath)
+
 # Build feature vectors from metadata (genres, actors, etc.)
+# With numWorkers > 1, catalogues of at least parallelMinRows movies are encoded on a process
+# pool (utils.parallelFeatures); the result is the same matrix as the serial path
 class MetadataPreprocessor:
-    def __init__(self, metadataDF: pd.DataFrame):
+    def __init__(self, metadataDF: pd.DataFrame, numWorkers: int = 1, parallelMinRows: int = 20000):
         self.metadataDF = metadataDF
+        self.numWorkers = numWorkers
+        self.parallelMinRows = parallelMinRows
+
+    def _parallelBuilder(self):
+        if self.numWorkers is None or self.numWorkers <= 1 or len(self.metadataDF) < self.parallelMinRows:
+            return None
+        from utils.parallelFeatures import ParallelFeatureBuilder
+        return ParallelFeatureBuilder(numWorkers=self.numWorkers)
 
     def encodeCategoricalFeatures(self) -> pd.DataFrame:
+        builder = self._parallelBuilder()
+        if builder is not None:
+            encoded = builder.multiLabel({col: self.metadataDF[col] for col in ("genres", "directors", "actors")})
+            return pd.concat([
+                pd.DataFrame(matrix, columns=[f"{prefix}_{c}" for c in classes])
+                for prefix, (matrix, classes) in zip(("genre", "director", "actor"), encoded.values())
+            ], axis=1)
+
+        from sklearn.preprocessing import MultiLabelBinarizer
         mlb = MultiLabelBinarizer()
 
         # Encode genres
@@ -71,9 +94,15 @@ class MetadataPreprocessor:
 
         return pd.concat([genresDF, directorsDF, actorsDF], axis=1)
 
-    def applyTfidfToPlots(self) -> pd.DataFrame:
+    def applyTfidfToPlots(self, maxFeatures: int = 100) -> pd.DataFrame:
         # Convert movie plots into TF-IDF matrix
-        tfidf = TfidfVectorizer(max_features=100, stop_words="english")
+        builder = self._parallelBuilder()
+        if builder is not None:
+            matrix, terms = builder.tfidf(self.metadataDF["overview"].fillna("").tolist(), maxFeatures=maxFeatures)
+            return pd.DataFrame(matrix.toarray(), columns=terms)
+
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        tfidf = TfidfVectorizer(max_features=maxFeatures, stop_words="english")
         matrix = tfidf.fit_transform(self.metadataDF["overview"].fillna(""))
         return pd.DataFrame(matrix.toarray(), columns=tfidf.get_feature_names_out())
 
@@ -92,4 +121,10 @@ class RatingsPreprocessor:
     def binarizeRatings(self, threshold: float = 3.5) -> pd.DataFrame:
         # Label ratings >= threshold as 1 (like), else 0 (dislike)
         self.ratingsDF["binaryRating"] = (self.ratingsDF["rating"] >= threshold).astype(int)
-        return self.ratingsDF
\ No newline at end of file
+        return self.ratingsDF
+
+    def splitHoldout(self, fraction: float = 0.2, seed: int = 42) -> tuple:
+        # Randomly hold out a fraction of each user's ratings (train, heldOut)
+        rng = np.random.default_rng(seed)
+        heldOut = rng.random(len(self.ratingsDF)) < fraction
+        return self.ratingsDF[~heldOut], self.ratingsDF[heldOut]
\ No newline at end of file
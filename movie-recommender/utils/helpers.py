@@ -22,3 +22,22 @@ def recallAtK(recommended: list, relevant: list, k: int = 10) -> float:
     topK = recommended[:k]
     hits = sum(1 for item in topK if item in relevant)
     return hits / len(relevant)
+
+# Min-max scale a score array to [0, 1] (same epsilon as the pandas path), per row when axis=1
+def minMaxScale(scores: np.ndarray, axis: int = None) -> np.ndarray:
+    low = scores.min(axis=axis, keepdims=True)
+    high = scores.max(axis=axis, keepdims=True)
+    return (scores - low) / (high - low + 1e-8)
+
+# Row indices of the k highest scores, best first, skipping excluded rows
+def topKIndices(scores: np.ndarray, k: int, excludeRows: np.ndarray = None) -> np.ndarray:
+    if excludeRows is not None and len(excludeRows):
+        scores = scores.copy()
+        scores[excludeRows] = -np.inf
+        k = min(k, len(scores) - len(np.unique(excludeRows)))
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
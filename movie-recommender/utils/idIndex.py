@@ -0,0 +1,111 @@
+from bisect import bisect_left
+import numpy as np
+
+_INT32 = np.iinfo(np.int32)
+_LOOP_MERGE_MAX = 4096      # adds up to this many new ids are merged in place, larger ones rebuild
+
+# Ids are stored as int32; anything outside that range would silently wrap
+def _checkRange(ids: np.ndarray) -> None:
+    if len(ids) and (ids.min() < _INT32.min or ids.max() > _INT32.max):
+        raise ValueError(f"ids must fit in int32, got values in [{ids.min()}, {ids.max()}]")
+
+# Compact id <-> row encoder: ids kept in row order plus a sorted copy for np.searchsorted.
+# Rows are never reassigned: new ids are appended after the existing ones, so an index passed
+# back into a retrain keeps every known id on its old row. The arrays are views of buffers
+# with spare capacity, so adds shift entries in place instead of reallocating everything.
+class IdIndex:
+    def __init__(self, ids=()):
+        ids = np.asarray(ids, dtype=np.int64).ravel()
+        _checkRange(ids)
+        ids = ids.astype(np.int32)
+        order = np.argsort(ids, kind="stable")
+        self._idsBuffer = ids.copy()
+        self._sortedBuffer = ids[order]
+        self._rowsBuffer = order.astype(np.int32)
+        self._setSize(len(ids))
+
+    def _setSize(self, size: int) -> None:
+        self.ids = self._idsBuffer[:size]                  # row -> id
+        self.sortedIds = self._sortedBuffer[:size]         # ids in ascending order
+        self.sortedRows = self._rowsBuffer[:size]          # row of each sorted id
+
+    def _reserve(self, size: int) -> None:
+        if size > len(self._idsBuffer):
+            capacity = max(size, 2 * len(self._idsBuffer))
+            for name in ("_idsBuffer", "_sortedBuffer", "_rowsBuffer"):
+                grown = np.empty(capacity, dtype=np.int32)
+                grown[:len(self.ids)] = getattr(self, name)[:len(self.ids)]
+                setattr(self, name, grown)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, itemId) -> bool:
+        return self.rowOf(itemId) >= 0
+
+    # Vectorized lookup, unknown ids map to -1
+    def rowsOf(self, itemIds) -> np.ndarray:
+        itemIds = np.asarray(itemIds, dtype=np.int64).ravel()
+        if len(self.ids) == 0 or len(itemIds) == 0:
+            return np.full(len(itemIds), -1, dtype=np.int32)
+
+        # Search in int32 like the stored ids: an int64 query would make searchsorted cast the whole
+        # sorted array on every call. Clipping keeps the order and cannot create false matches
+        query = np.clip(itemIds, _INT32.min, _INT32.max).astype(np.int32)
+        pos = np.searchsorted(self.sortedIds, query)
+        pos = np.minimum(pos, len(self.sortedIds) - 1)
+        found = self.sortedIds[pos] == itemIds
+        return np.where(found, self.sortedRows[pos], -1).astype(np.int32)
+
+    # Scalar lookup: bisect over a memoryview skips the NumPy call overhead of rowsOf
+    def rowOf(self, itemId) -> int:
+        sortedIds = memoryview(self.sortedIds)
+        pos = bisect_left(sortedIds, itemId)
+        if pos < len(sortedIds) and sortedIds[pos] == itemId:
+            return memoryview(self.sortedRows)[pos]
+        return -1
+
+    # Append unseen ids (first occurrence order) and return the rows of all of them
+    def add(self, itemIds) -> np.ndarray:
+        itemIds = np.asarray(itemIds, dtype=np.int64).ravel()
+        rows = self.rowsOf(itemIds)
+        missing = rows < 0
+        if missing.any():
+            newIds, first, inverse = np.unique(itemIds[missing], return_index=True, return_inverse=True)
+            _checkRange(newIds)
+            newIds = newIds.astype(np.int32)
+            arrival = np.argsort(first, kind="stable")                     # keep arrival order
+            size, count = len(self.ids), len(newIds)
+            newRows = np.empty(count, dtype=np.int32)                      # row of each sorted new id
+            newRows[arrival] = np.arange(size, size + count, dtype=np.int32)
+            self._reserve(size + count)
+            self._idsBuffer[size:size + count] = newIds[arrival]
+
+            if count > _LOOP_MERGE_MAX or count > size:
+                # Bulk add (e.g. setFactors after training): one argsort over all ids
+                order = np.argsort(self._idsBuffer[:size + count], kind="stable")
+                self._sortedBuffer[:size + count] = self._idsBuffer[order]
+                self._rowsBuffer[:size + count] = order
+            else:
+                positions = np.searchsorted(self.sortedIds, newIds)
+                # Merge the (already sorted) new ids in from the back, moving each run of old entries once
+                end = size + count
+                for j in range(count - 1, -1, -1):
+                    start = positions[j]
+                    run = size - start if j == count - 1 else positions[j + 1] - start
+                    self._sortedBuffer[end - run:end] = self._sortedBuffer[start:start + run]
+                    self._rowsBuffer[end - run:end] = self._rowsBuffer[start:start + run]
+                    end -= run + 1
+                    self._sortedBuffer[end] = newIds[j]
+                    self._rowsBuffer[end] = newRows[j]
+            self._setSize(size + count)
+            rows[missing] = newRows[inverse.ravel()]
+        return rows
+
+    # ids -> rows; with grow=True unknown ids are added instead of mapping to -1
+    def encode(self, itemIds, grow: bool = False) -> np.ndarray:
+        return self.add(itemIds) if grow else self.rowsOf(itemIds)
+
+    # rows -> ids
+    def decode(self, rows) -> np.ndarray:
+        return self.ids[np.asarray(rows, dtype=np.int64)]
@@ -0,0 +1,66 @@
+import json
+import os
+import numpy as np
+
+ARRAYS_FILE = "arrays.npz"
+MANIFEST_FILE = "manifest.json"
+
+# Save trained content/collab/hybrid state as plain arrays plus a small JSON manifest
+def saveModels(artifactDir: str, content, collab, hybrid) -> None:
+    os.makedirs(artifactDir, exist_ok=True)
+    featureArray, movieIndex = content.getCore()
+    extras = {}
+    if hybrid.popularityModel is not None:
+        extras.update({f"popularity_{key}": value for key, value in hybrid.popularityModel.getState().items()})
+    if hybrid.blendWeights is not None:
+        extras.update({f"blend_{key}": value for key, value in hybrid.blendWeights.getState().items()})
+    np.savez(
+        os.path.join(artifactDir, ARRAYS_FILE),
+        **extras,
+        featureArray=featureArray,
+        featureColumns=np.asarray(content.featureMatrix.columns, dtype=str),
+        contentMovieIds=movieIndex.ids,
+        userIds=collab.userIndex.ids,
+        collabMovieIds=collab.movieIndex.ids,
+        userFactors=collab.userFactors,
+        movieFactors=collab.movieFactors,
+    )
+    manifest = {"alpha": hybrid.alpha, "numFactors": collab.numFactors, "dtype": collab.dtype.name}
+    with open(os.path.join(artifactDir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+# Rebuild ready-to-serve models from saveModels output, without any training dependencies
+def loadModels(artifactDir: str):
+    import pandas as pd
+    from models.contentFilter import ContentBasedFilter
+    from models.collabFilter import CollaborativeFilter
+    from models.hybrid import HybridRecommender
+    from models.popularity import PopularityModel
+    from models.blendWeights import BlendWeightModel
+
+    with open(os.path.join(artifactDir, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    arrays = np.load(os.path.join(artifactDir, ARRAYS_FILE))
+
+    content = ContentBasedFilter(metadataDF=None)
+    content.featureMatrix = pd.DataFrame(arrays["featureArray"], index=arrays["contentMovieIds"],
+                                         columns=arrays["featureColumns"])
+
+    collab = CollaborativeFilter(numFactors=manifest["numFactors"], dtype=manifest.get("dtype", "float32"))
+    collab.setFactors(arrays["userIds"], arrays["collabMovieIds"], arrays["userFactors"], arrays["movieFactors"])
+
+    popularity = None
+    popularityState = {key[len("popularity_"):]: arrays[key] for key in arrays.files if key.startswith("popularity_")}
+    if popularityState:
+        popularity = PopularityModel()
+        popularity.setState(popularityState)
+
+    blendWeights = None
+    blendState = {key[len("blend_"):]: arrays[key] for key in arrays.files if key.startswith("blend_")}
+    if blendState:
+        blendWeights = BlendWeightModel()
+        blendWeights.setState(blendState)
+
+    hybrid = HybridRecommender(content, collab, alpha=manifest["alpha"], popularityModel=popularity,
+                               blendWeights=blendWeights)
+    return content, collab, hybrid
@@ -1,12 +1,24 @@
-import requests
 import pandas as pd
 import os
+import threading
 
 class OmdbFetcher:
     def __init__(self, apiKey: str, cachePath: str = "ml-100k/omdb_metadata.csv"):
         self.apiKey = apiKey
         self.cachePath = cachePath
-        self.cacheDF = self._loadCache()
+        self._cacheDF = None
+        self._cacheLock = threading.Lock()
+
+    # Cached metadata, read from disk on first use
+    @property
+    def cacheDF(self) -> pd.DataFrame:
+        if self._cacheDF is None:
+            self._cacheDF = self._loadCache()
+        return self._cacheDF
+
+    @cacheDF.setter
+    def cacheDF(self, value: pd.DataFrame) -> None:
+        self._cacheDF = value
 
     def _loadCache(self):
         if os.path.exists(self.cachePath):
@@ -14,12 +26,13 @@ class OmdbFetcher:
         else:
             return pd.DataFrame(columns=["movieId", "title", "genres", "directors", "actors", "overview", "voteAverage"])
 
+    # Write to a temp file and swap it in, so an exit mid-write never leaves a truncated cache
     def saveCache(self):
-        self.cacheDF.to_csv(self.cachePath, index=False)
+        tmpPath = f"{self.cachePath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self.cacheDF.to_csv(tmpPath, index=False)
+        os.replace(tmpPath, self.cachePath)
 
     def fetchMovie(self, movieId: int, imdbId: int) -> dict:
-        imdbFormatted = f"tt{int(imdbId):07d}"
-
         # Check if movieId is in the cache
         if movieId in self.cacheDF["movieId"].values:
             cachedRow = self.cacheDF[self.cacheDF["movieId"] == movieId].iloc[0].to_dict()
@@ -29,18 +42,26 @@ class OmdbFetcher:
             return cachedRow
 
         # Fetch from OMDb API if not in cache
+        movieData = self.requestMovie(movieId, imdbId)
+        if movieData:
+            self.addToCache([movieData])
+        return movieData
+
+    # Query OMDb for one movie without touching the cache, so it is safe to run on worker threads
+    def requestMovie(self, movieId: int, imdbId: int) -> dict:
+        import requests
         response = requests.get(
             "https://www.omdbapi.com/",
-            params={"apikey": self.apiKey, "i": imdbFormatted},
+            params={"apikey": self.apiKey, "i": f"tt{int(imdbId):07d}"},
             timeout=5
         )
-    
+
         data = response.json()
         if data.get("Response") == "False":
             print(f"❌ Error fetching movie {movieId} from OMDb: {data.get('Error', 'Unknown error')}")
             return {}
 
-        movieData = {
+        return {
             "movieId": movieId,
             "title": data.get("Title", ""),
             "genres": data.get("Genre", "").split(", "),
@@ -50,15 +71,21 @@ class OmdbFetcher:
             "voteAverage": float(data.get("imdbRating", 0)) if data.get("imdbRating") != "N/A" else 0
         }
 
-        # Append to cache
-        cacheEntry = movieData.copy()
-        cacheEntry["genres"] = str(cacheEntry["genres"])
-        cacheEntry["directors"] = str(cacheEntry["directors"])
-        cacheEntry["actors"] = str(cacheEntry["actors"])
-        self.cacheDF = pd.concat([self.cacheDF, pd.DataFrame([cacheEntry])], ignore_index=True)
-        self.saveCache()
-
-        return movieData
+    # Append fetched movies to the cache and save it once
+    def addToCache(self, movies: list) -> None:
+        cacheEntries = []
+        for movieData in movies:
+            cacheEntry = movieData.copy()
+            cacheEntry["genres"] = str(cacheEntry["genres"])
+            cacheEntry["directors"] = str(cacheEntry["directors"])
+            cacheEntry["actors"] = str(cacheEntry["actors"])
+            cacheEntries.append(cacheEntry)
+        if not cacheEntries:
+            return
+
+        with self._cacheLock:
+            self.cacheDF = pd.concat([self.cacheDF, pd.DataFrame(cacheEntries)], ignore_index=True)
+            self.saveCache()
 
     def getMovieTitle(self, movieId: int) -> str:
         # Check if title is already cached
@@ -81,6 +108,7 @@ class OmdbFetcher:
 
     def addMovieByTitle(self, title: str) -> dict:
         # Query OMDb API by title
+        import requests
         response = requests.get(
             "https://www.omdbapi.com/",
             params={"apikey": self.apiKey, "t": title},
@@ -104,11 +132,5 @@ class OmdbFetcher:
         }
 
         # Append to cache
-        cacheEntry = movieData.copy()
-        cacheEntry["genres"] = str(cacheEntry["genres"])
-        cacheEntry["directors"] = str(cacheEntry["directors"])
-        cacheEntry["actors"] = str(cacheEntry["actors"])
-        self.cacheDF = pd.concat([self.cacheDF, pd.DataFrame([cacheEntry])], ignore_index=True)
-        self.saveCache()
-
+        self.addToCache([movieData])
         return movieData
@@ -0,0 +1,135 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix, vstack
+
+# Process-pool versions of the MetadataPreprocessor feature steps for large catalogues.
+# Workers tokenize / label row chunks once, returning sparse counts over a chunk-local
+# vocabulary; the parent merges vocabularies and document frequencies, fixes the global
+# columns and assembles the shards. Output is identical to the serial sklearn path:
+#   TfidfVectorizer(max_features, stop_words) -> same tokens, vocabulary, idf and l2 rows
+#   MultiLabelBinarizer().fit_transform       -> same sorted classes and indicator matrix
+class ParallelFeatureBuilder:
+    def __init__(self, numWorkers: int = None, chunkSize: int = 20000):
+        self.numWorkers = numWorkers
+        self.chunkSize = chunkSize
+
+    # TF-IDF matrix (csr, float64) and its feature names for a list of documents
+    def tfidf(self, documents: List[str], maxFeatures: int = None, stopWords: str = "english") -> tuple:
+        chunks = self._chunks(list(documents))
+        with self._executor() as executor:
+            shards = list(executor.map(_countTerms, chunks, [stopWords] * len(chunks)))
+
+        # Global term ids in order of first appearance, as CountVectorizer assigns them
+        globalIds = {}
+        for localTerms, _, _, _ in shards:
+            for term in localTerms:
+                globalIds.setdefault(term, len(globalIds))
+        localToGlobal = [np.array([globalIds[t] for t in localTerms], dtype=np.int64) for localTerms, _, _, _ in shards]
+        termFreq = np.zeros(len(globalIds), dtype=np.float64)
+        docFreq = np.zeros(len(globalIds), dtype=np.float64)
+        for (_, _, indices, counts), toGlobal in zip(shards, localToGlobal):
+            termFreq += np.bincount(toGlobal[indices], weights=counts, minlength=len(globalIds))
+            docFreq += np.bincount(toGlobal[indices], minlength=len(globalIds))
+
+        # Alphabetical vocabulary, limited like CountVectorizer._limit_features: same argsort over
+        # corpus frequencies in the same order, so ties resolve identically
+        terms = np.array(sorted(globalIds), dtype=object)
+        alphaToGlobal = np.array([globalIds[t] for t in terms], dtype=np.int64)
+        if maxFeatures is not None and len(terms) > maxFeatures:
+            keep = np.zeros(len(terms), dtype=bool)
+            keep[(-termFreq[alphaToGlobal]).argsort()[:maxFeatures]] = True
+            terms, alphaToGlobal = terms[keep], alphaToGlobal[keep]
+        columnOf = np.full(len(globalIds), -1, dtype=np.int64)
+        columnOf[alphaToGlobal] = np.arange(len(terms))
+
+        # Smooth idf exactly as TfidfTransformer computes it
+        idf = np.full(len(terms), len(documents) + 1, dtype=np.float64)
+        idf /= docFreq[alphaToGlobal] + 1.0
+        np.log(idf, out=idf)
+        idf += 1.0
+
+        matrix = vstack([_assembleShard(shard, toGlobal, columnOf, len(terms)) for shard, toGlobal
+                         in zip(shards, localToGlobal)], format="csr")
+        from sklearn.preprocessing import normalize
+        matrix.data *= idf[matrix.indices]
+        return normalize(matrix, norm="l2", copy=False), terms.tolist()
+
+    # {column: (dense 0/1 indicator matrix, classes)} for list-like columns, all fitted in one pool
+    def multiLabel(self, columns: Dict[str, pd.Series]) -> Dict[str, tuple]:
+        chunked = {name: self._chunks(values.tolist()) for name, values in columns.items()}
+        with self._executor() as executor:
+            futures = {name: [executor.submit(_collectLabels, chunk) for chunk in chunks]
+                       for name, chunks in chunked.items()}
+            shards = {name: [future.result() for future in chunkFutures] for name, chunkFutures in futures.items()}
+
+        encoded = {}
+        for name, columnShards in shards.items():
+            classes = _sortedClasses(set().union(*(localLabels for localLabels, _, _ in columnShards)))
+            position = {label: col for col, label in enumerate(classes.tolist())}
+            matrices = []
+            for localLabels, indptr, indices in columnShards:
+                toColumn = np.array([position[label] for label in localLabels], dtype=np.int64)
+                matrices.append(csr_matrix((np.ones(len(indices), dtype=int), toColumn[indices], indptr),
+                                           shape=(len(indptr) - 1, len(classes))))
+            encoded[name] = (vstack(matrices, format="csr").toarray(), classes)
+        return encoded
+
+    def _chunks(self, items: list) -> list:
+        return [items[start:start + self.chunkSize] for start in range(0, len(items), self.chunkSize)] or [[]]
+
+    # forkserver, not fork: the pool is started from pipeline stage threads while another stage may
+    # be inside BLAS/OpenMP, and a forked child can inherit their locks held and deadlock. The
+    # single-threaded server preloads the worker imports once, so workers start without them
+    def _executor(self):
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["utils.parallelFeatures", "sklearn.feature_extraction.text"])
+        return ProcessPoolExecutor(max_workers=self.numWorkers, mp_context=context)
+
+# Keep a shard's entries whose term survived the vocabulary limit, on global columns. Within a
+# row, entries stay in term first-appearance order like CountVectorizer's, so the l2 norms
+# accumulate in the same order and match bit for bit
+def _assembleShard(shard, toGlobal: np.ndarray, columnOf: np.ndarray, numColumns: int) -> csr_matrix:
+    _, indptr, indices, counts = shard
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    globalTerms = toGlobal[indices]
+    columns = columnOf[globalTerms]
+    kept = columns >= 0
+    rows, globalTerms, columns, counts = rows[kept], globalTerms[kept], columns[kept], counts[kept]
+    order = np.lexsort((globalTerms, rows))
+    rowCounts = np.bincount(rows, minlength=len(indptr) - 1)
+    newIndptr = np.concatenate([[0], np.cumsum(rowCounts)])
+    return csr_matrix((counts[order].astype(np.float64), columns[order], newIndptr), shape=(len(indptr) - 1, numColumns))
+
+# Worker functions live at module level so the pool can pickle them
+def _countTerms(documents: List[str], stopWords) -> tuple:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    analyze = TfidfVectorizer(stop_words=stopWords).build_analyzer()
+    localIds = {}
+    indptr, indices, counts = [0], [], []
+    for doc in documents:
+        docCounts = Counter(localIds.setdefault(t, len(localIds)) for t in analyze(doc))
+        indices.extend(docCounts.keys())
+        counts.extend(docCounts.values())
+        indptr.append(len(indices))
+    return (list(localIds), np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64),
+            np.asarray(counts, dtype=np.int64))
+
+# Labels per row exactly as MultiLabelBinarizer iterates them, over a chunk-local label list
+def _collectLabels(rows: list) -> tuple:
+    localIds = {}
+    indptr, indices = [0], []
+    for row in rows:
+        indices.extend({localIds.setdefault(label, len(localIds)) for label in row})
+        indptr.append(len(indices))
+    return list(localIds), np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64)
+
+# Class order of MultiLabelBinarizer: np.unique over ints, or over objects otherwise
+def _sortedClasses(labels: set) -> np.ndarray:
+    values = list(labels)
+    classes = np.empty(len(values), dtype=int if all(isinstance(c, int) for c in values) else object)
+    classes[:] = values
+    return np.unique(classes)
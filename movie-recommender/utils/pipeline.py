@@ -0,0 +1,170 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List
+
+# One unit of work in a Pipeline. fn receives the outputs of `deps` positionally (in order)
+# followed by `params` as keyword arguments. `inputs` are files whose contents feed the stage.
+class Stage:
+    def __init__(self, name: str, fn: Callable, deps: List[str] = (), params: dict = None,
+                 inputs: List[str] = (), checkpoint: bool = True):
+        self.name = name
+        self.fn = fn
+        self.deps = list(deps)
+        self.params = params or {}
+        self.inputs = list(inputs)
+        self.checkpoint = checkpoint    # False for cheap stages not worth writing to disk
+
+# Stage DAG with content-hashed on-disk checkpoints. A stage's key hashes its code, params,
+# input file contents and the keys of its dependencies, so a change anywhere upstream reruns
+# exactly the stages downstream of it. Completed stages are checkpointed as they finish, so a
+# failed run resumes from the last good stage; stages whose dependencies are met run in parallel.
+class Pipeline:
+    def __init__(self, checkpointDir: str = "checkpoints", maxWorkers: int = 4):
+        self.checkpointDir = checkpointDir
+        self.maxWorkers = maxWorkers
+        self.stages: Dict[str, Stage] = {}
+        self.timings: Dict[str, float] = {}    # seconds per stage executed in the last run
+        self._fileHashes = {}                   # (path, size, mtime) -> sha256 of contents
+
+    def add(self, name: str, fn: Callable, deps: List[str] = (), **kwargs) -> "Pipeline":
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' already defined")
+        self.stages[name] = Stage(name, fn, deps, **kwargs)
+        return self
+
+    # Produce the outputs of `targets` (default: every stage), reusing valid checkpoints.
+    # force=True ignores existing checkpoints and rebuilds them
+    def run(self, targets: List[str] = None, force: bool = False) -> Dict[str, object]:
+        targets = list(targets or self.stages)
+        order = self._upstreamOf(targets)
+        keys = {}
+        for name in order:
+            keys[name] = self._stageKey(self.stages[name], keys)
+
+        # Walk back from the targets: a stage with a usable checkpoint stops the walk
+        toRun, toLoad = set(), set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name in toRun or name in toLoad:
+                continue
+            if not force and self._hasCheckpoint(name, keys[name]):
+                toLoad.add(name)
+            else:
+                toRun.add(name)
+                pending.extend(self.stages[name].deps)
+
+        values = {name: self._loadCheckpoint(name, keys[name]) for name in order if name in toLoad}
+        for name in order:
+            if name in toLoad:
+                print(f"✅ {name}: restored from checkpoint")
+        self.timings = {}
+        self._execute([name for name in order if name in toRun], keys, values)
+        return {name: values[name] for name in targets}
+
+    # Run stages as soon as their dependencies are available
+    def _execute(self, names: List[str], keys: dict, values: dict) -> None:
+        remaining = list(names)
+        running = {}
+        failure = None
+        with ThreadPoolExecutor(max_workers=self.maxWorkers, thread_name_prefix="stage") as executor:
+            while remaining or running:
+                if failure is None:
+                    for name in [n for n in remaining if all(d in values for d in self.stages[n].deps)]:
+                        remaining.remove(name)
+                        print(f"▶️ {name}: running")
+                        running[executor.submit(self._runStage, self.stages[name], keys[name], values)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        values[name] = future.result()
+                    except Exception as e:
+                        print(f"❌ {name}: failed ({e}); finished stages are checkpointed, rerun to resume")
+                        failure = failure or e
+        if failure is not None:
+            raise failure
+
+    def _runStage(self, stage: Stage, key: str, values: dict):
+        start = time.perf_counter()
+        value = stage.fn(*[values[dep] for dep in stage.deps], **stage.params)
+        self.timings[stage.name] = time.perf_counter() - start
+        if stage.checkpoint:
+            self._saveCheckpoint(stage.name, key, value)
+        print(f"✅ {stage.name}: done in {self.timings[stage.name]:.2f}s")
+        return value
+
+    # Dependencies of `targets` (inclusive) in definition order, which is topological
+    def _upstreamOf(self, targets: List[str]) -> List[str]:
+        needed = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'")
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.stages[name].deps)
+        return [name for name in self.stages if name in needed]
+
+    def _stageKey(self, stage: Stage, keys: dict) -> str:
+        try:
+            code = inspect.getsource(stage.fn)
+        except (OSError, TypeError):
+            code = getattr(stage.fn, "__qualname__", repr(stage.fn))
+        payload = {
+            "name": stage.name,
+            "code": code,
+            "params": stage.params,
+            "inputs": {path: self._fileHash(path) for path in stage.inputs},
+            "deps": [keys[dep] for dep in stage.deps],
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=repr).encode()
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+    # sha256 of a file, remembered per (size, mtime) so each file is read once per process
+    def _fileHash(self, path: str) -> str:
+        if not os.path.exists(path):
+            return "missing"
+        stat = os.stat(path)
+        cacheKey = (path, stat.st_size, stat.st_mtime_ns)
+        if cacheKey not in self._fileHashes:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            self._fileHashes[cacheKey] = digest.hexdigest()
+        return self._fileHashes[cacheKey]
+
+    def _checkpointPath(self, name: str, key: str) -> str:
+        return os.path.join(self.checkpointDir, f"{name}-{key}.pkl")
+
+    def _hasCheckpoint(self, name: str, key: str) -> bool:
+        return self.stages[name].checkpoint and os.path.exists(self._checkpointPath(name, key))
+
+    def _loadCheckpoint(self, name: str, key: str):
+        with open(self._checkpointPath(name, key), "rb") as f:
+            return pickle.load(f)
+
+    # Write to a temp file and rename, so an interrupted save never leaves a half checkpoint;
+    # older checkpoints of the same stage are removed afterwards
+    def _saveCheckpoint(self, name: str, key: str, value) -> None:
+        os.makedirs(self.checkpointDir, exist_ok=True)
+        path = self._checkpointPath(name, key)
+        tmpPath = f"{path}.{os.getpid()}.tmp"
+        with open(tmpPath, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpPath, path)
+        for fileName in os.listdir(self.checkpointDir):
+            if fileName.startswith(f"{name}-") and fileName.endswith(".pkl") and fileName != os.path.basename(path):
+                os.remove(os.path.join(self.checkpointDir, fileName))
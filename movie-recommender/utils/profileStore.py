@@ -0,0 +1,160 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List
+import numpy as np
+from utils.userProfile import UserProfile
+
+# Persistent UserProfile store on SQLite. Arrays are stored as raw little-endian bytes
+# (int32 ids, float32 feedback and vectors); profiles load lazily into an LRU cache
+# and changed profiles are written back in batches inside one transaction. One lock guards the
+# connection and caches, so a store opened on one thread can be used from another (e.g. the
+# stream ingest thread).
+class ProfileStore:
+    def __init__(self, dbPath: str = "ml-100k/profiles.db", cacheSize: int = 10000, batchSize: int = 500):
+        self.dbPath = dbPath
+        self.cacheSize = cacheSize
+        self.batchSize = batchSize
+        self._cache = OrderedDict()     # userId -> UserProfile, least recently used first
+        self._dirty = {}                # userId -> UserProfile waiting to be written
+        self._lock = threading.RLock()
+
+        self.conn = sqlite3.connect(dbPath, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                userId INTEGER PRIMARY KEY,
+                favorites BLOB NOT NULL,
+                feedbackIds BLOB NOT NULL,
+                feedbackValues BLOB NOT NULL,
+                contentVector BLOB,
+                collabVector BLOB,
+                updatedAt REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.flush()
+            return self.conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def __contains__(self, userId) -> bool:
+        with self._lock:
+            if userId in self._cache:
+                return True
+            return self.conn.execute("SELECT 1 FROM profiles WHERE userId = ?", (int(userId),)).fetchone() is not None
+
+    # Profile for one user, from cache, then disk, else a new empty profile
+    def get(self, userId: int) -> UserProfile:
+        return self.getMany([userId])[userId]
+
+    # Load many profiles with one query per 500 missing ids
+    def getMany(self, userIds: List[int]) -> Dict[int, UserProfile]:
+        with self._lock:
+            result = {}
+            missing = []
+            for userId in userIds:
+                if userId in self._cache:
+                    self._cache.move_to_end(userId)
+                    result[userId] = self._cache[userId]
+                else:
+                    missing.append(int(userId))
+
+            for start in range(0, len(missing), 500):
+                batch = missing[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.conn.execute(
+                    "SELECT userId, favorites, feedbackIds, feedbackValues, contentVector, collabVector "
+                    f"FROM profiles WHERE userId IN ({placeholders})", batch
+                ).fetchall()
+                for row in rows:
+                    result[row[0]] = self._remember(_decode(row))
+
+            for userId in missing:
+                if userId not in result:
+                    result[userId] = self._remember(UserProfile(userId=userId))
+            return result
+
+    # Load profiles ahead of time so later get() calls are cache hits
+    def warm(self, userIds: List[int]) -> None:
+        self.getMany(userIds)
+
+    # Mark a profile as changed; written on the next batch flush
+    def put(self, profile: UserProfile) -> None:
+        with self._lock:
+            self._remember(profile)
+            self._dirty[profile.userId] = profile
+            if len(self._dirty) >= self.batchSize:
+                self.flush()
+
+    def delete(self, userId: int) -> None:
+        with self._lock:
+            self._cache.pop(userId, None)
+            self._dirty.pop(userId, None)
+            self.conn.execute("DELETE FROM profiles WHERE userId = ?", (int(userId),))
+            self.conn.commit()
+
+    # Write every pending profile in a single transaction
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO profiles "
+                    "(userId, favorites, feedbackIds, feedbackValues, contentVector, collabVector, updatedAt) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [_encode(profile) + (now,) for profile in self._dirty.values()]
+                )
+            self._dirty.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self.conn.close()
+
+    def _remember(self, profile: UserProfile) -> UserProfile:
+        self._cache[profile.userId] = profile
+        self._cache.move_to_end(profile.userId)
+        while len(self._cache) > self.cacheSize:
+            userId, _ = next(iter(self._cache.items()))
+            if userId in self._dirty:
+                self.flush()
+            self._cache.popitem(last=False)
+        return profile
+
+def _toBlob(array, dtype) -> bytes:
+    return None if array is None else np.ascontiguousarray(array, dtype=dtype).tobytes()
+
+def _fromBlob(blob, dtype):
+    return None if blob is None else np.frombuffer(blob, dtype=dtype).copy()
+
+def _encode(profile: UserProfile) -> tuple:
+    return (
+        int(profile.userId),
+        _toBlob(profile.favoriteIds, "<i4"),
+        _toBlob(profile.feedbackIds, "<i4"),
+        _toBlob(profile.feedbackValues, "<f4"),
+        _toBlob(profile.contentVector, "<f4"),
+        _toBlob(profile.collabVector, "<f4"),
+    )
+
+def _decode(row) -> UserProfile:
+    userId, favorites, feedbackIds, feedbackValues, contentVector, collabVector = row
+    profile = UserProfile(userId=userId)
+    profile.favoriteIds = _fromBlob(favorites, "<i4").astype(np.int32)
+    profile.feedbackIds = _fromBlob(feedbackIds, "<i4").astype(np.int32)
+    profile.feedbackValues = _fromBlob(feedbackValues, "<f4").astype(np.float32)
+    profile.contentVector = _fromBlob(contentVector, "<f4")
+    profile.collabVector = _fromBlob(collabVector, "<f4")
+    return profile
@@ -0,0 +1,259 @@
+import argparse
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, List
+import numpy as np
+from utils.userProfile import UserProfile
+
+# Streaming ingest: read rating/click events from an append-only file or an in-process queue,
+# apply them in micro-batches as incremental collab and content profile updates, and keep
+# every affected user's top-N fresh. Events are (userId, movieId, rating, receivedAt).
+#   python -m utils.streamIngest --model DIR --follow ml-100k/stream.csv
+
+# Tail an append-only CSV of userId,movieId,rating[,timestamp] lines. Partial trailing lines wait
+# for the writer to finish them; a truncated file is read again from the top.
+class FileTailSource:
+    def __init__(self, path: str, fromStart: bool = True, pollInterval: float = 0.01, readSize: int = 1 << 20):
+        self.path = path
+        self.pollInterval = pollInterval
+        self.readSize = readSize        # bytes read per pass, so a long backlog is parsed in pieces
+        self.skipped = 0                # malformed lines
+        self._offset = 0 if fromStart or not os.path.exists(path) else os.path.getsize(path)
+        self._partial = b""
+        self._pending = deque()
+
+    # Up to maxEvents events, waiting at most `timeout` seconds for the first one
+    def poll(self, maxEvents: int, timeout: float) -> list:
+        deadline = time.perf_counter() + timeout
+        while not self._pending:
+            self._readNew()
+            if self._pending or time.perf_counter() >= deadline:
+                break
+            time.sleep(self.pollInterval)
+        return [self._pending.popleft() for _ in range(min(maxEvents, len(self._pending)))]
+
+    def _readNew(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        if os.path.getsize(self.path) < self._offset:
+            self._offset, self._partial = 0, b""
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(self.readSize)
+        if not data:
+            return
+        self._offset += len(data)
+        receivedAt = time.perf_counter()
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        for line in lines:
+            fields = line.strip().split(b",")
+            if len(fields) < 3 or fields[0] == b"userId":
+                continue
+            try:
+                self._pending.append((int(fields[0]), int(fields[1]), float(fields[2]), receivedAt))
+            except ValueError:
+                self.skipped += 1
+
+# Stand-in for a socket or message queue: producers call put(), the ingestor polls
+class QueueSource:
+    def __init__(self, maxSize: int = 0):
+        self.queue = queue.Queue(maxSize)
+        self.skipped = 0
+
+    def put(self, userId: int, movieId: int, rating: float) -> None:
+        self.queue.put((int(userId), int(movieId), float(rating), time.perf_counter()))
+
+    def poll(self, maxEvents: int, timeout: float) -> list:
+        events = []
+        try:
+            events.append(self.queue.get(timeout=timeout))
+            while len(events) < maxEvents:
+                events.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        return events
+
+# Throughput and end-to-end latency (event received -> user's top-N refreshed), over a sliding window
+class StreamMetrics:
+    def __init__(self, window: int = 10000):
+        self.events = 0
+        self.batches = 0
+        self.usersRefreshed = 0
+        self.busySeconds = 0.0          # time spent applying batches
+        self.startedAt = time.perf_counter()
+        self.latencies = deque(maxlen=window)      # seconds per event
+        self.batchSeconds = deque(maxlen=window)   # seconds per batch
+
+    def record(self, events: list, users: int, batchStart: float, batchEnd: float) -> None:
+        self.events += len(events)
+        self.batches += 1
+        self.usersRefreshed += users
+        self.busySeconds += batchEnd - batchStart
+        self.batchSeconds.append(batchEnd - batchStart)
+        self.latencies.extend(batchEnd - event[3] for event in events)
+
+    def snapshot(self) -> dict:
+        elapsed = time.perf_counter() - self.startedAt
+        latencies = np.asarray(self.latencies) * 1000
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+        return {
+            "events": self.events,
+            "batches": self.batches,
+            "usersRefreshed": self.usersRefreshed,
+            "eventsPerSec": self.events / elapsed if elapsed > 0 else 0.0,
+            "applyEventsPerSec": self.events / self.busySeconds if self.busySeconds > 0 else 0.0,
+            "latencyP50Ms": float(p50),
+            "latencyP95Ms": float(p95),
+            "latencyP99Ms": float(p99),
+            "meanBatchMs": float(np.mean(self.batchSeconds) * 1000) if self.batchSeconds else 0.0,
+        }
+
+class StreamIngestor:
+    def __init__(self, hybrid, source, profileStore=None, batchSize: int = 256, maxDelay: float = 0.05,
+                 topN: int = 10, likeThreshold: float = 3.5):
+        self.hybrid = hybrid
+        self.source = source
+        self.profileStore = profileStore    # utils.profileStore.ProfileStore, or None to keep profiles in memory
+        self.batchSize = batchSize
+        self.maxDelay = maxDelay            # longest wait to fill a batch once its first event arrived
+        self.topN = topN
+        self.likeThreshold = likeThreshold
+        self.metrics = StreamMetrics()
+        self.topNCache: Dict[int, List[int]] = {}
+        self._profiles: Dict[int, UserProfile] = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self.error = None                   # exception that ended a background run(), re-raised by stop()
+
+    # Collect one micro-batch: block up to `timeout` for the first event, then up to maxDelay for more
+    def nextBatch(self, timeout: float = 0.5) -> list:
+        events = self.source.poll(self.batchSize, timeout)
+        deadline = time.perf_counter() + self.maxDelay
+        while events and len(events) < self.batchSize:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            more = self.source.poll(self.batchSize - len(events), remaining)
+            if not more:
+                break
+            events.extend(more)
+        return events
+
+    # Apply one batch: per-event factor and profile updates, then one top-N refresh per affected user.
+    # Updates write the models in place, so serve from other threads only if stale reads are acceptable
+    def applyBatch(self, events: list) -> List[int]:
+        if not events:
+            return []
+        batchStart = time.perf_counter()
+        content, collab = self.hybrid.contentModel, self.hybrid.collabModel
+        userIds = list(dict.fromkeys(event[0] for event in events))
+        collab.addUsers(userIds)            # one encoder/buffer growth for all of the batch's new users
+        profiles = self._getProfiles(userIds)
+
+        for userId, movieId, rating, _ in events:
+            profile = profiles[userId]
+            liked = 1 if rating >= self.likeThreshold else 0
+            collab.updateUserVector(userId, movieId, rating)
+            content.updateUserProfile(profile.contentVector, movieId, liked)
+            profile.addFeedback(movieId, liked)
+            if liked:
+                profile.addFavorites([movieId])
+
+        for userId in userIds:
+            profile = profiles[userId]
+            self.topNCache[userId] = self.hybrid.recommendMovies(
+                userId, profile.contentVector, self.topN, exclude=profile.feedbackIds.tolist(),
+                favorites=profile.favorites)
+            if self.profileStore is not None:
+                self.profileStore.put(profile)
+
+        self.metrics.record(events, len(userIds), batchStart, time.perf_counter())
+        return userIds
+
+    # Profiles for the batch's users, with a content vector to update in place
+    def _getProfiles(self, userIds: List[int]) -> Dict[int, UserProfile]:
+        if self.profileStore is not None:
+            profiles = self.profileStore.getMany(userIds)
+        else:
+            profiles = {uid: self._profiles.setdefault(uid, UserProfile(userId=uid)) for uid in userIds}
+        for profile in profiles.values():
+            if profile.contentVector is None:
+                profile.contentVector = self.hybrid.contentModel.buildUserProfileArray(profile.favorites)
+        return profiles
+
+    # Latest top-N for a user, as of the last batch that touched them
+    def getTopN(self, userId: int) -> List[int]:
+        return self.topNCache.get(userId, [])
+
+    # Ingest until stop() is called, `duration` seconds pass, or maxEvents events were applied
+    def run(self, duration: float = None, maxEvents: int = None, idleTimeout: float = None) -> dict:
+        start = time.perf_counter()
+        lastEvent = start
+        while not self._stop.is_set():
+            now = time.perf_counter()
+            if duration is not None and now - start >= duration:
+                break
+            if maxEvents is not None and self.metrics.events >= maxEvents:
+                break
+            if idleTimeout is not None and now - lastEvent >= idleTimeout:
+                break
+            if self.applyBatch(self.nextBatch()):
+                lastEvent = time.perf_counter()
+        if self.profileStore is not None:
+            self.profileStore.flush()
+        return self.metrics.snapshot()
+
+    # Run on a daemon thread; a failure there is kept in self.error instead of dying silently
+    def start(self) -> threading.Thread:
+        self.error = None
+        self._thread = threading.Thread(target=self._runInBackground, daemon=True, name="stream-ingest")
+        self._thread.start()
+        return self._thread
+
+    def _runInBackground(self) -> None:
+        try:
+            self.run()
+        except Exception as e:
+            self.error = e
+            print(f"❌ Stream ingest stopped after {self.metrics.events} events: {e!r}")
+
+    # Stop ingesting, wait for the background thread, and re-raise any error it hit
+    def stop(self, timeout: float = None) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        if self.error is not None:
+            raise self.error
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tail an interaction log and keep top-N recommendations fresh")
+    parser.add_argument("--model", required=True, metavar="DIR", help="model saved with main.py --save-model")
+    parser.add_argument("--follow", required=True, help="append-only CSV of userId,movieId,rating[,timestamp]")
+    parser.add_argument("--from-end", action="store_true", help="skip events already in the file")
+    parser.add_argument("--batch", type=int, default=256, help="maximum events per micro-batch")
+    parser.add_argument("--max-delay", type=float, default=0.05, help="seconds to wait for a batch to fill")
+    parser.add_argument("--report-every", type=float, default=5.0, help="seconds between metric reports")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    from utils.modelStore import loadModels
+
+    args = parse_args()
+    _, _, hybrid = loadModels(args.model)
+    ingestor = StreamIngestor(hybrid, FileTailSource(args.follow, fromStart=not args.from_end),
+                              batchSize=args.batch, maxDelay=args.max_delay)
+    thread = ingestor.start()
+    try:
+        while thread.is_alive():
+            thread.join(args.report_every)
+            m = ingestor.metrics.snapshot()
+            print(f" {m['events']} events | {m['eventsPerSec']:.0f}/s | p50 {m['latencyP50Ms']:.1f} ms "
+                  f"| p99 {m['latencyP99Ms']:.1f} ms | {m['usersRefreshed']} top-N refreshes")
+    except KeyboardInterrupt:
+        pass
+    ingestor.stop()
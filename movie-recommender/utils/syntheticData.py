@@ -0,0 +1,267 @@
+import argparse
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# Streaming generator for ml-100k-shaped datasets of arbitrary size.
+# Users and movies follow power-law activity/popularity; everything is written chunk by chunk,
+# so only per-user and per-movie parameter arrays are ever held in memory.
+#   python -m utils.syntheticData --users 1000000 --movies 200000 --ratings 300000000 --out data/synth
+
+GENRES = ["Drama", "Comedy", "Thriller", "Action", "Romance", "Adventure", "Crime", "Sci-Fi", "Horror",
+          "Children", "Animation", "Fantasy", "Mystery", "War", "Documentary", "Musical", "Western",
+          "Film-Noir", "IMAX"]
+GENRE_WEIGHTS = np.array([2081, 2074, 1783, 1450, 1363, 1061, 869, 619, 556, 532, 497, 417, 410, 367,
+                          315, 207, 165, 87, 158], dtype=np.float64)
+PLOT_WORDS = ("young man woman family life love story world war city town friend father mother son "
+              "daughter secret past team mission murder detective police crime gang money heist journey "
+              "island ship space planet alien future time escape prison killer night house ghost school "
+              "teacher student band music dream king queen kingdom battle army soldier hero villain "
+              "robot scientist experiment virus doctor small town farm road trip wedding divorce brother "
+              "sister revenge betrayal truth lie power fight survive discover return lost hidden dark").split()
+BINARY_COLUMNS = {"userId": "<i4", "movieId": "<i4", "rating": "<f4", "timestamp": "<i8"}
+
+# np.unique for an int64 array via sort + neighbour compare (much faster than hashing here)
+def sortedUnique(values: np.ndarray) -> np.ndarray:
+    values = np.sort(values)
+    if len(values) == 0:
+        return values
+    return values[np.concatenate([[True], values[1:] != values[:-1]])]
+
+class SyntheticDatasetGenerator:
+    def __init__(self, numUsers: int, numMovies: int, numRatings: int, metadataMovies: int = None,
+                 userAlpha: float = 0.8, movieAlpha: float = 1.0, minPerUser: int = 20,
+                 chunkRatings: int = 1_000_000, seed: int = 42):
+        self.numUsers = numUsers
+        self.numMovies = numMovies
+        self.numRatings = numRatings
+        self.metadataMovies = numMovies if metadataMovies is None else min(metadataMovies, numMovies)
+        self.userAlpha = userAlpha          # power-law exponent of user activity
+        self.movieAlpha = movieAlpha        # power-law exponent of movie popularity
+        self.minPerUser = minPerUser
+        self.chunkRatings = chunkRatings
+        self.rng = np.random.default_rng(seed)
+
+        self.userCounts = self._userCounts()
+        popularity = self._powerLaw(numMovies, movieAlpha)
+        self.movieCdf = np.cumsum(popularity)
+        self.movieCdf /= self.movieCdf[-1]
+        self.movieQuality = np.clip(3.2 + 0.6 * self.rng.standard_normal(numMovies) + 8 * popularity, 1.0, 4.8)
+
+    # Power-law weights over ranks, assigned to ids in random order, normalized to sum to 1
+    def _powerLaw(self, n: int, alpha: float) -> np.ndarray:
+        weights = np.arange(1, n + 1, dtype=np.float64) ** -alpha
+        weights /= weights.sum()
+        return self.rng.permutation(weights)
+
+    # Ratings per user: a floor of minPerUser plus a power-law share of the rest, summing to numRatings.
+    # Even the heaviest users rate at most a quarter of the catalogue (ml-100k tops out near 28%)
+    def _userCounts(self) -> np.ndarray:
+        floor = min(self.minPerUser, self.numRatings // self.numUsers, self.numMovies)
+        cap = max(self.numMovies // 4, floor)
+        weights = self._powerLaw(self.numUsers, self.userAlpha)
+        counts = np.full(self.numUsers, floor, dtype=np.int64)
+
+        # Hand out what is left in proportion to weight; capped users' excess goes round again
+        for _ in range(20):
+            remaining = min(self.numRatings, cap * self.numUsers) - int(counts.sum())
+            uncapped = counts < cap
+            if remaining <= 0 or not uncapped.any():
+                break
+            share = np.where(uncapped, weights, 0.0)
+            share *= remaining / share.sum()
+            extra = np.floor(share).astype(np.int64)
+            shortfall = remaining - int(extra.sum())
+            extra[np.argsort(share - extra)[::-1][:shortfall]] += 1
+            counts = np.minimum(counts + extra, cap)
+        return counts
+
+    # Yield ratings DataFrames of roughly chunkRatings rows, each holding whole users
+    def iterRatingChunks(self):
+        boundaries = np.cumsum(self.userCounts)
+        start = 0
+        while start < self.numUsers:
+            consumed = boundaries[start - 1] if start else 0
+            stop = int(np.searchsorted(boundaries, consumed + self.chunkRatings, side="right"))
+            stop = max(stop, start + 1)
+            yield self._ratingsForUsers(start, stop)
+            start = stop
+
+    def _ratingsForUsers(self, start: int, stop: int) -> pd.DataFrame:
+        counts = self.userCounts[start:stop]
+        userIdx = np.repeat(np.arange(start, stop, dtype=np.int64), counts)
+        pairs = sortedUnique(userIdx * self.numMovies + self._drawMovies(len(userIdx)))
+
+        # Repeated (user, movie) draws are dropped; top up the users that came up short.
+        # Chunks hold whole users, so deduplicating within the chunk is exact
+        for _ in range(8):
+            deficit = counts - np.bincount(pairs // self.numMovies - start, minlength=stop - start)
+            if not deficit.any():
+                break
+            extraUsers = np.repeat(np.arange(start, stop, dtype=np.int64), deficit + deficit // 4)
+            extra = extraUsers * self.numMovies + self._drawMovies(len(extraUsers))
+            pairs = self._trimToCounts(sortedUnique(np.concatenate([pairs, extra])), counts, start)
+        pairs = self._fillDeficit(pairs, counts, start)
+        userIdx, movieIdx = np.divmod(pairs, self.numMovies)
+
+        userBias = 0.4 * self.rng.standard_normal(stop - start)
+        raw = self.movieQuality[movieIdx] + userBias[userIdx - start] + 0.8 * self.rng.standard_normal(len(pairs))
+        return pd.DataFrame({
+            "userId": (userIdx + 1).astype(np.int32),
+            "movieId": (movieIdx + 1).astype(np.int32),
+            "rating": np.clip(np.round(raw * 2) / 2, 0.5, 5.0).astype(np.float32),
+            "timestamp": self.rng.integers(946684800, 1577836800, len(pairs), dtype=np.int64),
+        })
+
+    def _drawMovies(self, n: int) -> np.ndarray:
+        movieIdx = np.searchsorted(self.movieCdf, self.rng.random(n), side="right")
+        return np.minimum(movieIdx, self.numMovies - 1)
+
+    # Heavy users can stay short after the popularity-weighted rounds, since their remaining
+    # unrated movies are rare draws. Fill them uniformly from the movies they have not rated;
+    # counts never exceed numMovies // 4, so there are always enough
+    def _fillDeficit(self, pairs: np.ndarray, counts: np.ndarray, start: int) -> np.ndarray:
+        users = pairs // self.numMovies - start
+        deficit = counts - np.bincount(users, minlength=len(counts))
+        if not deficit.any():
+            return pairs
+
+        extra = []
+        for u in np.flatnonzero(deficit):
+            lo, hi = np.searchsorted(users, [u, u + 1])
+            unrated = np.setdiff1d(np.arange(self.numMovies), pairs[lo:hi] % self.numMovies, assume_unique=True)
+            picks = self.rng.choice(unrated, size=deficit[u], replace=False)
+            extra.append((u + start) * self.numMovies + picks)
+        return np.sort(np.concatenate([pairs, *extra]))
+
+    # Keep a random subset of at most counts[u] pairs per user from sorted, unique pairs
+    def _trimToCounts(self, pairs: np.ndarray, counts: np.ndarray, start: int) -> np.ndarray:
+        users = pairs // self.numMovies - start
+        over = np.bincount(users, minlength=len(counts)) > counts
+        if not over.any():
+            return pairs
+
+        keep = ~over[users]
+        for u in np.flatnonzero(over):
+            lo, hi = np.searchsorted(users, [u, u + 1])
+            keep[lo + self.rng.choice(hi - lo, size=counts[u], replace=False)] = True
+        return pairs[keep]
+
+    # Yield movie-level DataFrames (movies.csv, links.csv and omdb_metadata.csv columns) in chunks
+    def iterMovieChunks(self, chunkMovies: int = 100_000):
+        genreProbs = GENRE_WEIGHTS / GENRE_WEIGHTS.sum()
+        for start in range(0, self.numMovies, chunkMovies):
+            movieIds = np.arange(start + 1, min(start + chunkMovies, self.numMovies) + 1)
+            n = len(movieIds)
+            years = self.rng.integers(1920, 2020, n)
+            titles = [f"Synthetic Movie {mid}" for mid in movieIds]
+            genreLists = [self.rng.choice(GENRES, size=k, replace=False, p=genreProbs).tolist()
+                          for k in self.rng.integers(1, 4, n)]
+
+            movies = pd.DataFrame({
+                "movieId": movieIds,
+                "title": [f"{title} ({year})" for title, year in zip(titles, years)],
+                "genres": ["|".join(genres) for genres in genreLists],
+            })
+            links = pd.DataFrame({
+                "movieId": movieIds,
+                "imdbId": [f"{1000000 + mid:07d}" for mid in movieIds],
+                "tmdbId": movieIds + 500000,
+            })
+
+            # Only the first metadataMovies ids get OMDb-style metadata, like the real cache
+            withMeta = movieIds <= self.metadataMovies
+            metaIds = movieIds[withMeta]
+            metadata = pd.DataFrame({
+                "movieId": metaIds,
+                "title": [titles[i] for i in np.flatnonzero(withMeta)],
+                "genres": [str(genreLists[i]) for i in np.flatnonzero(withMeta)],
+                "directors": [str([f"Director {row[0]}"]) for row in self._zipfNames(len(metaIds), 1)],
+                "actors": [str([f"Actor {a}" for a in dict.fromkeys(row)]) for row in self._zipfNames(len(metaIds), 3)],
+                "overview": [" ".join(words).capitalize() + "." for words in self._plots(len(metaIds))],
+                "voteAverage": np.round(self.movieQuality[metaIds - 1] * 2, 1),
+            })
+            yield movies, links, metadata
+
+    # People ids for directors/actors: a few prolific names, a long tail of one-offs
+    def _zipfNames(self, n: int, perMovie: int) -> np.ndarray:
+        return np.minimum(self.rng.zipf(1.6, size=(n, perMovie)), max(self.numMovies, 1)).tolist()
+
+    def _plots(self, n: int) -> np.ndarray:
+        wordProbs = np.arange(1, len(PLOT_WORDS) + 1, dtype=np.float64) ** -0.9
+        wordProbs /= wordProbs.sum()
+        return self.rng.choice(PLOT_WORDS, size=(n, 18), p=wordProbs)
+
+    # Write the dataset to outDir as ml-100k-style CSVs, or with binary ratings columns
+    def write(self, outDir: str, fmt: str = "csv") -> dict:
+        os.makedirs(outDir, exist_ok=True)
+        written = 0
+        if fmt == "csv":
+            with open(os.path.join(outDir, "ratings.csv"), "w", newline="") as f:
+                for i, chunk in enumerate(self.iterRatingChunks()):
+                    chunk.to_csv(f, header=(i == 0), index=False)
+                    written += len(chunk)
+                    print(f" ratings: {written:,} written")
+        elif fmt == "bin":
+            files = {col: open(os.path.join(outDir, f"ratings.{col}.bin"), "wb") for col in BINARY_COLUMNS}
+            try:
+                for chunk in self.iterRatingChunks():
+                    for col, dtype in BINARY_COLUMNS.items():
+                        chunk[col].to_numpy().astype(dtype).tofile(files[col])
+                    written += len(chunk)
+                    print(f" ratings: {written:,} written")
+            finally:
+                for f in files.values():
+                    f.close()
+            with open(os.path.join(outDir, "ratings.json"), "w") as f:
+                json.dump({"rows": written, "columns": BINARY_COLUMNS}, f, indent=2)
+        else:
+            raise ValueError(f"Unknown format: {fmt}")
+
+        paths = {name: os.path.join(outDir, f"{name}.csv") for name in ("movies", "links", "omdb_metadata")}
+        handles = {name: open(path, "w", newline="") for name, path in paths.items()}
+        try:
+            for i, (movies, links, metadata) in enumerate(self.iterMovieChunks()):
+                movies.to_csv(handles["movies"], header=(i == 0), index=False)
+                links.to_csv(handles["links"], header=(i == 0), index=False)
+                metadata.to_csv(handles["omdb_metadata"], header=(i == 0), index=False)
+        finally:
+            for f in handles.values():
+                f.close()
+
+        summary = {"users": self.numUsers, "movies": self.numMovies, "ratings": written,
+                   "metadataMovies": self.metadataMovies, "format": fmt}
+        print(f" Done: {summary}")
+        return summary
+
+# Open binary ratings written with fmt="bin" as a DataFrame over memory-mapped columns. copy=False
+# keeps every column a view of its file (the dtypes differ, so no block consolidation copies them)
+def loadBinaryRatings(folder: str) -> pd.DataFrame:
+    with open(os.path.join(folder, "ratings.json")) as f:
+        layout = json.load(f)
+    return pd.DataFrame({
+        col: np.memmap(os.path.join(folder, f"ratings.{col}.bin"), dtype=dtype, mode="r", shape=(layout["rows"],))
+        for col, dtype in layout["columns"].items()
+    }, copy=False)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic MovieLens-style dataset")
+    parser.add_argument("--users", type=int, default=6100)
+    parser.add_argument("--movies", type=int, default=97000)
+    parser.add_argument("--ratings", type=int, default=1_000_000)
+    parser.add_argument("--metadata-movies", type=int, default=None, help="movies that get omdb_metadata rows")
+    parser.add_argument("--user-alpha", type=float, default=0.8, help="power-law exponent of user activity")
+    parser.add_argument("--movie-alpha", type=float, default=1.0, help="power-law exponent of movie popularity")
+    parser.add_argument("--chunk", type=int, default=1_000_000, help="approximate ratings per written chunk")
+    parser.add_argument("--format", choices=["csv", "bin"], default="csv", help="ratings file format")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", required=True, help="output folder")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    SyntheticDatasetGenerator(args.users, args.movies, args.ratings, metadataMovies=args.metadata_movies,
+                              userAlpha=args.user_alpha, movieAlpha=args.movie_alpha,
+                              chunkRatings=args.chunk, seed=args.seed).write(args.out, args.format)
@@ -0,0 +1,99 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+import pandas as pd
+from utils.omdbFetcher import OmdbFetcher
+
+UNKNOWN_TITLE = "Unknown Title"
+
+# Resolve titles and metadata for a whole result set at once. Answers come from dicts built
+# once from movies.csv and the OMDb cache; ids missing from the cache are fetched concurrently
+# in the background and show up in later calls.
+class TitleResolver:
+    def __init__(self, fetcher: OmdbFetcher, moviesPath: str = "ml-100k/movies.csv",
+                 linksPath: str = "ml-100k/links.csv", maxWorkers: int = 8):
+        self.fetcher = fetcher
+        self.moviesPath = moviesPath
+        self.linksPath = linksPath
+        self.maxWorkers = maxWorkers
+        self._titles = None             # movieId -> title (cache title preferred over movies.csv)
+        self._metadata = None           # movieId -> cached OMDb row
+        self._imdbIds = None            # movieId -> imdbId
+        self._pending = set()           # ids with a background fetch in flight
+        self._lock = threading.Lock()
+        self._executor = None
+        self._batches = []              # background batch threads
+
+    # Build the lookup dicts on first use
+    def _ensureLoaded(self) -> None:
+        if self._titles is not None:
+            return
+        movies = pd.read_csv(self.moviesPath, usecols=["movieId", "title"])
+        links = pd.read_csv(self.linksPath, usecols=["movieId", "imdbId"])
+        cache = self.fetcher.cacheDF
+
+        titles = dict(zip(movies["movieId"].tolist(), movies["title"].tolist()))
+        titles.update(zip(cache["movieId"].tolist(), cache["title"].tolist()))
+        self._metadata = {row["movieId"]: row for row in cache.to_dict("records")}
+        self._imdbIds = dict(zip(links["movieId"].tolist(), links["imdbId"].tolist()))
+        self._titles = titles
+
+    # Titles for every id, returned immediately; cache misses are prefetched in the background
+    def resolve(self, movieIds: List[int], prefetch: bool = True) -> Dict[int, str]:
+        self._ensureLoaded()
+        if prefetch:
+            self.prefetch(movieIds)
+        return {mid: self._titles.get(mid, UNKNOWN_TITLE) for mid in movieIds}
+
+    def getTitle(self, movieId: int) -> str:
+        return self.resolve([movieId])[movieId]
+
+    # Cached OMDb metadata rows (None until fetched) for every id
+    def resolveMetadata(self, movieIds: List[int], prefetch: bool = True) -> Dict[int, dict]:
+        self._ensureLoaded()
+        if prefetch:
+            self.prefetch(movieIds)
+        return {mid: self._metadata.get(mid) for mid in movieIds}
+
+    # Start one background batch for ids that are neither cached nor already in flight
+    def prefetch(self, movieIds: List[int]) -> None:
+        self._ensureLoaded()
+        with self._lock:
+            misses = [mid for mid in dict.fromkeys(movieIds)
+                      if mid not in self._metadata and mid not in self._pending and mid in self._imdbIds]
+            if not misses:
+                return
+            self._pending.update(misses)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.maxWorkers, thread_name_prefix="omdb")
+            batch = threading.Thread(target=self._fetchBatch, args=(misses,), daemon=True)
+            self._batches = [t for t in self._batches if t.is_alive()] + [batch]
+        batch.start()
+
+    # Fetch misses concurrently, then write them to the OMDb cache in one save
+    def _fetchBatch(self, movieIds: List[int]) -> None:
+        futures = {mid: self._executor.submit(self.fetcher.requestMovie, mid, self._imdbIds[mid]) for mid in movieIds}
+        fetched = []
+        for mid, future in futures.items():
+            try:
+                movieData = future.result()
+            except Exception as e:
+                print(f"❌ Failed to fetch metadata for movieId {mid}: {e}")
+                movieData = None
+            if movieData:
+                fetched.append(movieData)
+
+        self.fetcher.addToCache(fetched)
+        with self._lock:
+            for movieData in fetched:
+                self._metadata[movieData["movieId"]] = movieData
+                if movieData.get("title"):
+                    self._titles[movieData["movieId"]] = movieData["title"]
+            self._pending.difference_update(movieIds)
+
+    # Block until background fetches finish (e.g. before exiting)
+    def wait(self, timeout: float = None) -> None:
+        with self._lock:
+            batches = list(self._batches)
+        for batch in batches:
+            batch.join(timeout)
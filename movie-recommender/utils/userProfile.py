@@ -1,52 +1,70 @@
+import numpy as np
 import pandas as pd
-from typing import List
+from types import MappingProxyType
+from typing import List, Mapping, Tuple
 
 class UserProfile:
     def __init__(self, userId):
-        # Each user has a unique ID and a list of their favorite movies
+        # Each user has a unique ID and a set of favorite movies, kept as a sorted int32 array
         self.userId = userId
-        self.favorites = []
-        self.feedbackHistory = {}       # Feedback per movie (liked/disliked)
-        self.contentVector = None       # Averaged vector from favorite movies
-        self.collabVector = None        # Latent vector from collaborative filtering
+        self.favoriteIds = np.empty(0, dtype=np.int32)
+        self.feedbackIds = np.empty(0, dtype=np.int32)      # movies with feedback, sorted
+        self.feedbackValues = np.empty(0, dtype=np.float32) # feedback per movie (0/1 or a rating), aligned with feedbackIds
+        self.contentVector = None       # Averaged vector from favorite movies (float32)
+        self.collabVector = None        # Latent vector from collaborative filtering (float32)
+
+    # Favorites as a read-only tuple of movieIds (no duplicates, ascending); change them with addFavorites
+    @property
+    def favorites(self) -> Tuple[int, ...]:
+        return tuple(self.favoriteIds.tolist())
+
+    # Feedback as a read-only {movieId: feedback} mapping; change it with addFeedback
+    @property
+    def feedbackHistory(self) -> Mapping[int, float]:
+        return MappingProxyType(dict(zip(self.feedbackIds.tolist(), self.feedbackValues.tolist())))
 
     def addFavorites(self, movie_ids: List[int]):
-        # Add one or more favorite movies
-        self.favorites.extend(movie_ids)
+        # Add one or more favorite movies; repeats are ignored
+        self.favoriteIds = np.union1d(self.favoriteIds, np.asarray(movie_ids, dtype=np.int32)).astype(np.int32)
 
     def get_favorite_movies(self) -> List[int]:
         # Return list of favorites
-        return self.favorites
+        return self.favoriteIds.tolist()
 
-    def addFeedback(self, movieId: int, feedback: int) -> None:
-        # Store feedback score (like=5, dislike=1, etc.)
-        self.feedbackHistory[movieId] = feedback
+    def addFeedback(self, movieId: int, feedback: float) -> None:
+        # Store feedback score (like=1/dislike=0, or a rating such as 4.5), replacing any earlier feedback on the movie
+        pos = np.searchsorted(self.feedbackIds, movieId)
+        if pos < len(self.feedbackIds) and self.feedbackIds[pos] == movieId:
+            self.feedbackValues[pos] = feedback
+        else:
+            self.feedbackIds = np.insert(self.feedbackIds, pos, movieId)
+            self.feedbackValues = np.insert(self.feedbackValues, pos, feedback)
 
     def buildContentVector(self, featureMatrix: pd.DataFrame) -> pd.Series:
         # Make sure there are favorite movies to use
-        if not self.favorites:
+        if not len(self.favoriteIds):
             raise ValueError("No favorite movies to build content vector.")
 
         # Get features for the favorite movies only
-        fav_features = featureMatrix.loc[self.favorites]
+        fav_features = featureMatrix.loc[self.favoriteIds.tolist()]
 
         # Average them to make a user profile vector
-        self.contentVector = fav_features.mean(axis=0)
-        return self.contentVector
+        self.contentVector = fav_features.to_numpy(dtype=np.float32).mean(axis=0)
+        return pd.Series(self.contentVector, index=featureMatrix.columns)
 
     def updateCollaborativeVector(self, userFactors: pd.DataFrame) -> None:
         # Look up the user's learned collaborative vector
         if self.userId not in userFactors.index:
             raise ValueError(f"User {self.userId} not found in collaborative model factors.")
 
-        self.collabVector = userFactors.loc[self.userId]
+        self.collabVector = userFactors.loc[self.userId].to_numpy(dtype=np.float32)
 
     def getProfileSummary(self) -> dict:
         # Summarize what's in the user profile
         return {
             "userId": self.userId,
             "favorites": self.favorites,
-            "feedbackHistory": self.feedbackHistory,
+            "feedbackHistory": dict(self.feedbackHistory),
             "contentVectorShape": None if self.contentVector is None else self.contentVector.shape,
             "collabVectorShape": None if self.collabVector is None else self.collabVector.shape
         }